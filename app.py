@@ -2,8 +2,13 @@ import streamlit as st
 import base64
 import os
 
+from utils.data_store import get_repository
+
 st.set_page_config(page_title="Job Architecture", layout="wide")
 
+# inicia o warm-up dos arquivos de data/ (uma vez por processo do servidor)
+get_repository()
+
 def load_icon_png(path):
     if not os.path.exists(path):
         return ""
@@ -0,0 +1,6 @@
+# benchmarks/__init__.py
+"""
+Benchmarks do motor de match sobre arquiteturas sintéticas (ver synthetic.py).
+
+    python -m benchmarks.bench_match --sizes 1000 10000 100000 1000000
+"""
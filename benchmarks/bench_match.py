@@ -0,0 +1,273 @@
+# benchmarks/bench_match.py
+"""
+Benchmark do motor de match em arquiteturas sintéticas de vários tamanhos.
+
+    python -m benchmarks.bench_match --sizes 1000 10000 100000 1000000 --output bench.json
+
+Para cada tamanho mede:
+  - index_build / signature_index_build: MatchIndex e SignatureIndex;
+  - single_match: compute_job_match (sub-família do formulário, top-5);
+  - top_k_all: o melhor perfil da arquitetura inteira, exaustivo
+    (MatchIndex.score + _top_k) e com poda (MatchIndex.top_k), com a
+    fração de perfis visitados pela poda;
+  - prune_<seleção>: o caminho do compute_job_match com todos os perfis
+    como candidatos (`positions`), poda x exaustivo, para cada tipo de
+    seleção de KPIs/competências (kpi_comp, kpi, comp, none), com o
+    caminho que _prune_pays escolhe e se ele foi o mais rápido;
+  - batch_match: compute_job_matches de um lote de formulários.
+
+Os tempos saem em ms (p50/p90/p99/máx/média) e o pico de memória de cada
+etapa via tracemalloc, numa execução separada (o tracemalloc pesa nos
+tempos). O resultado é um JSON com "meta" (versões, máquina, parâmetros)
+e "results" (uma linha por tamanho x benchmark).
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import sklearn.neighbors  # noqa: F401  (o import não entra no tempo do 1º SignatureIndex)
+
+from benchmarks.synthetic import synthetic_forms, synthetic_profiles
+from match_engine import (
+    MatchIndex,
+    SignatureIndex,
+    _prune_pays,
+    _top_k,
+    compute_job_match,
+    compute_job_matches,
+    encode_forms,
+    grade_hints,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# seleções do prune_<seleção>: (usa os KPIs do formulário, usa as competências)
+PRUNE_SELECTIONS = {"kpi_comp": (True, True), "kpi": (True, False), "comp": (False, True), "none": (False, False)}
+
+# formulários por seleção no prune_<seleção> (4 seleções x 2 caminhos por formulário)
+PRUNE_QUERIES = 50
+
+# a matriz densa do SignatureIndex (perfis x vocabulário) não cabe em memória acima disso
+SIGNATURE_MAX_SIZE = 100_000
+
+
+# ==========================================================
+# MEDIÇÃO
+# ==========================================================
+def _latencies(samples: list[float]) -> dict:
+    ms = np.asarray(samples) * 1000
+    return {
+        "runs": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p90_ms": round(float(np.percentile(ms, 90)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "max_ms": round(float(ms.max()), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+    }
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _peak_mb(fn: Callable[[], Any]) -> float:
+    """Pico alocado (Python + numpy) durante uma execução de fn, em MB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / 2**20 if sys.platform == "darwin" else rss / 1024, 1)  # bytes no macOS, KiB no Linux
+
+
+# ==========================================================
+# BENCHMARKS DE UM TAMANHO
+# ==========================================================
+def bench_size(
+    n: int,
+    seed: int = 0,
+    queries: int = 200,
+    batch: int = 2000,
+    repeat: int = 3,
+    signature_max: int = SIGNATURE_MAX_SIZE,
+) -> list[dict]:
+    """Linhas de resultado de todos os benchmarks para `n` perfis."""
+    t0 = time.perf_counter()
+    df = synthetic_profiles(n, seed)
+    generate_s = time.perf_counter() - t0
+    forms = synthetic_forms(df, max(queries, batch), seed + 1)
+    base = {"size": n, "sub_families": int(df.groupby(["Job Family", "Sub Job Family"], observed=True).ngroups)}
+    rows = []
+
+    def record(benchmark: str, **fields) -> None:
+        rows.append({**base, "benchmark": benchmark, **fields})
+
+    # ---- construção dos índices
+    index = MatchIndex(df)
+    record(
+        "index_build",
+        **_latencies(_timed(lambda: MatchIndex(df), repeat)),
+        peak_traced_mb=_peak_mb(lambda: MatchIndex(df)),
+        generate_s=round(generate_s, 3),
+    )
+    if n <= signature_max:
+        record(
+            "signature_index_build",
+            **_latencies(_timed(lambda: SignatureIndex(df, index), repeat)),
+            peak_traced_mb=_peak_mb(lambda: SignatureIndex(df, index)),
+        )
+
+    # ---- match de um formulário (filtro por sub-família)
+    single = forms[:queries]
+    samples = []
+    for form in single:
+        t = time.perf_counter()
+        compute_job_match(form, df, index, top_k=5)
+        samples.append(time.perf_counter() - t)
+    candidates = [len(index.candidates(f["job_family"], f["sub_job_family"])) for f in single]
+    record(
+        "single_match",
+        **_latencies(samples),
+        peak_traced_mb=_peak_mb(lambda: [compute_job_match(f, df, index, top_k=5) for f in single[:20]]),
+        candidates_p50=float(np.median(candidates)),
+    )
+
+    # ---- melhor perfil da arquitetura inteira: exaustivo x poda
+    hints = grade_hints(encode_forms(single)).astype(float)
+    exhaustive, pruned, visited = [], [], []
+    for hint, form in zip(hints, single):
+        kpis, comps = form["kpis_selected"], form["competencies_selected"]
+        t = time.perf_counter()
+        _top_k(index.score(hint, kpis, comps)["score"], 5)
+        exhaustive.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        found = index.top_k(hint, kpis, comps, 5)
+        pruned.append(time.perf_counter() - t)
+        visited.append(found["visited"])
+    visited_pct = 100 * np.asarray(visited) / n
+    record("top_k_all_exhaustive", **_latencies(exhaustive))
+    record(
+        "top_k_all_pruned",
+        **_latencies(pruned),
+        visited_p50=float(np.median(visited)),
+        visited_max=int(np.max(visited)),
+        visited_pct_p50=round(float(np.median(visited_pct)), 3),
+        visited_pct_p90=round(float(np.percentile(visited_pct, 90)), 3),
+    )
+
+    # ---- caminho do compute_job_match: poda x exaustivo sobre `positions`
+    positions = np.arange(n)
+    for label, (use_kpis, use_comps) in PRUNE_SELECTIONS.items():
+        exhaustive, pruned, visited, caps = [], [], [], []
+        for hint, form in zip(hints[:PRUNE_QUERIES], single[:PRUNE_QUERIES]):
+            kpis = form["kpis_selected"] if use_kpis else []
+            comps = form["competencies_selected"] if use_comps else []
+            t = time.perf_counter()
+            _top_k(index.score(hint, kpis, comps, positions)["score"], 5)
+            exhaustive.append(time.perf_counter() - t)
+            t = time.perf_counter()
+            found = index.top_k(hint, kpis, comps, 5, positions)
+            pruned.append(time.perf_counter() - t)
+            visited.append(found["visited"])
+            caps.append(index.overlap_cap(kpis, comps))
+        exhaustive_p50 = float(np.median(exhaustive)) * 1000
+        pruned_lat = _latencies(pruned)
+        cap = float(np.median(caps))
+        chosen = "pruned" if _prune_pays(n, cap) else "exhaustive"
+        faster = "pruned" if pruned_lat["p50_ms"] < exhaustive_p50 else "exhaustive"
+        record(
+            f"prune_{label}",
+            **pruned_lat,
+            exhaustive_p50_ms=round(exhaustive_p50, 4),
+            overlap_cap=round(cap, 3),
+            visited_pct_p50=round(float(np.median(100 * np.asarray(visited) / n)), 3),
+            chosen=chosen,
+            chosen_is_faster=chosen == faster,
+        )
+
+    # ---- lote
+    frame = pd.DataFrame.from_records(forms[:batch])
+    samples = _timed(lambda: compute_job_matches(frame, index, top_k=5), repeat)
+    record(
+        "batch_match",
+        **_latencies(samples),
+        forms=len(frame),
+        forms_per_s=round(len(frame) / float(np.median(samples)), 1),
+        peak_traced_mb=_peak_mb(lambda: compute_job_matches(frame, index, top_k=5)),
+    )
+
+    for row in rows:
+        row["max_rss_mb"] = _max_rss_mb()
+    return rows
+
+
+# ==========================================================
+# CLI
+# ==========================================================
+def _meta(args: argparse.Namespace) -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "queries": args.queries,
+        "batch": args.batch,
+        "repeat": args.repeat,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do motor de match em arquiteturas sintéticas.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="nº de perfis de cada rodada")
+    parser.add_argument("--output", type=Path, default=Path("bench_match.json"), help="JSON de resultados")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", type=int, default=200, help="formulários do single_match / top_k_all")
+    parser.add_argument("--batch", type=int, default=2000, help="formulários do batch_match")
+    parser.add_argument("--repeat", type=int, default=3, help="repetições dos builds e do lote")
+    parser.add_argument("--signature-max", type=int, default=SIGNATURE_MAX_SIZE,
+                        help="maior tamanho com signature_index_build")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n in args.sizes:
+        rows = bench_size(n, args.seed, args.queries, args.batch, args.repeat, args.signature_max)
+        results.extend(rows)
+        for row in rows:
+            extra = f" visitados {row['visited_pct_p50']}%" if "visited_pct_p50" in row else ""
+            if "chosen" in row:
+                extra += (
+                    f" exaustivo p50 {row['exhaustive_p50_ms']:.3f} ms, escolhido {row['chosen']}"
+                    f"{'' if row['chosen_is_faster'] else ' (mais lento!)'}"
+                )
+            print(f"{n:>9} {row['benchmark']:<22} p50 {row['p50_ms']:>10.3f} ms  p99 {row['p99_ms']:>10.3f} ms{extra}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({"meta": _meta(args), "results": results}, indent=2), encoding="utf-8")
+    print(f"→ {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# benchmarks/bench_render.py
+"""
+Micro-benchmark do html_renderer.render_job_description sobre os perfis do
+Job Profile.xlsx (data/), lado a lado com o renderer antigo em f-strings
+(legacy_render_job_description, mantido aqui só como referência).
+
+    python -m benchmarks.bench_render --calls 5000 --output bench_render.json
+
+Mede, para cada renderer, o tempo por chamada (µs, p50/p90/p99/máx/média),
+o pico alocado por chamada (tracemalloc, numa passada separada) e o tamanho
+do HTML gerado. Antes de medir confere que os dois geram o mesmo HTML.
+"""
+import argparse
+import html
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_match import _latencies
+from html_renderer import ICON_DEFS, ICONS_SVG, JOB_CARD_CSS, RENDER_COLUMNS, SECTIONS_ORDER, render_job_description
+from utils.data_loader import load_dataset
+
+
+def legacy_render_job_description(best_match_row: pd.Series, final_score: float) -> str:
+    """
+    O render_job_description de antes do CompiledTemplate: Series.get por
+    coluna e uma f-string por seção a cada chamada. Mesmo HTML de saída
+    (CSS e ícones de hoje), para comparar só a montagem.
+    """
+
+    def safe_get(col):
+        try:
+            val = best_match_row.get(col, "")
+            if pd.isna(val):
+                return ""
+            return str(val)
+        except:
+            return ""
+
+    job_title = html.escape(safe_get("Job Profile"))
+    gg = html.escape(safe_get("Global Grade"))
+    jf = html.escape(safe_get("Job Family"))
+    sf = html.escape(safe_get("Sub Job Family"))
+    cp = html.escape(safe_get("Career Path"))
+    fc = html.escape(safe_get("Full Job Code"))
+
+    out = [JOB_CARD_CSS, ICON_DEFS]
+
+    # topo
+    out.append("<div class='job-card'>")
+
+    out.append(f"""
+        <div class="job-title">{job_title}</div>
+
+        <div class="job-subtitle">
+            GG {gg} • Job Match
+            <span class="pill">{final_score}%</span>
+        </div>
+
+        <div class="meta-card">
+            <b>Job Family:</b> {jf}<br>
+            <b>Sub Job Family:</b> {sf}<br>
+            <b>Career Path:</b> {cp}<br>
+            <b>Full Job Code:</b> {fc}
+        </div>
+    """)
+
+    out.append("</div>")
+
+    # seções completas (mesmo se vazias!)
+    for sec in SECTIONS_ORDER:
+        raw_text = safe_get(sec)
+        icon_svg = ICONS_SVG.get(sec, "")
+
+        out.append(f"""
+            <div class="section-box">
+                <div class="section-title">
+                    {icon_svg} {html.escape(sec)}
+                </div>
+                <div class="section-line"></div>
+                <div class="section-text">{html.escape(raw_text)}</div>
+            </div>
+        """)
+
+    return "\n".join(out)
+
+
+# renderers comparados, na ordem do relatório
+RENDERERS: dict[str, Callable[[pd.Series, float], str]] = {
+    "legacy_fstring": legacy_render_job_description,
+    "compiled_template": render_job_description,
+}
+
+
+def bench_render(rows: list, calls: int, render: Callable[[pd.Series, float], str] = render_job_description) -> dict:
+    """Tempos e memória de `calls` renderizações, percorrendo `rows` em ciclo."""
+    picks = [rows[i % len(rows)] for i in range(calls)]
+
+    samples = []
+    for row in picks:
+        t0 = time.perf_counter()
+        render(row, 87)
+        samples.append(time.perf_counter() - t0)
+
+    # pico de cada chamada acima do que já estava alocado
+    peaks = []
+    tracemalloc.start()
+    try:
+        for row in picks[:min(calls, 500)]:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            render(row, 87)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+
+    sizes = [len(render(row, 87).encode("utf-8")) for row in rows]
+    us = {k.replace("_ms", "_us"): round(v * 1000, 2) for k, v in _latencies(samples).items() if k != "runs"}
+    return {
+        "calls": calls,
+        **us,
+        "peak_alloc_bytes_mean": int(np.mean(peaks)),
+        "html_bytes_mean": int(np.mean(sizes)),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark do render_job_description.")
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--output", type=Path, default=None, help="JSON de resultados (opcional)")
+    args = parser.parse_args(argv)
+
+    df = load_dataset("job_profile", args.data_dir, columns=RENDER_COLUMNS)
+    if df is None:
+        raise SystemExit("Job Profile.xlsx não encontrado na pasta data/")
+    rows = [row for _, row in df.iterrows()]
+
+    mismatched = sum(legacy_render_job_description(row, 87) != render_job_description(row, 87) for row in rows)
+    if mismatched:
+        raise SystemExit(f"os renderers divergem em {mismatched} perfis")
+
+    results = []
+    for name, render in RENDERERS.items():
+        result = {"renderer": name, **bench_render(rows, args.calls, render)}
+        results.append(result)
+        print(
+            f"{name:<18} {result['calls']} chamadas: p50 {result['p50_us']} µs, p99 {result['p99_us']} µs, "
+            f"pico alocado {result['peak_alloc_bytes_mean']} B/chamada, HTML {result['html_bytes_mean']} B"
+        )
+    legacy, current = results
+    print(
+        f"p50 {legacy['p50_us'] / current['p50_us']:.2f}x mais rápido, "
+        f"pico alocado {legacy['peak_alloc_bytes_mean'] / current['peak_alloc_bytes_mean']:.2f}x menor"
+    )
+    if args.output:
+        meta = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "profiles": len(rows),
+        }
+        args.output.write_text(json.dumps({"meta": meta, "results": results}, indent=2), encoding="utf-8")
+        print(f"→ {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/synthetic.py
+"""
+Job Profiles sintéticos com as proporções do Job Profile.xlsx real (825
+perfis), para medir o motor em tamanhos que o arquivo real não tem:
+
+  - sub-famílias com ~14 perfis em média (de 1 a algumas dezenas), ~4 por
+    família;
+  - Global Grade 2-21, média ~10.6, parecido dentro da sub-família;
+  - Career Level com a letra da banda + dígito, coerente com o grade;
+  - KPIs vazios em ~3/4 dos perfis, senão 1 a ~14 itens de um vocabulário
+    de ~300 com frequência decrescente (inclui KPI_OPTIONS do formulário);
+  - 3 competências distintas de um vocabulário de 14 (inclui
+    COMPETENCY_OPTIONS).
+
+Mesmo seed → mesmo frame. O resultado já passa por normalize_job_profile.
+"""
+import numpy as np
+import pandas as pd
+
+from match_engine import COMPETENCY_OPTIONS, FORM_OPTIONS, KPI_OPTIONS, SIGNATURE_FIELDS
+from utils.data_loader import normalize_job_profile
+
+# médias medidas no Job Profile.xlsx
+PROFILES_PER_SUB_FAMILY = 13.75
+SUB_FAMILIES_PER_FAMILY = 4
+KPI_EMPTY_SHARE = 0.74
+
+KPI_VOCAB = KPI_OPTIONS + [f"KPI {i:03d}" for i in range(300 - len(KPI_OPTIONS))]
+COMPETENCY_VOCAB = COMPETENCY_OPTIONS + [
+    "Drives results", "Business insight", "Develops talent",
+    "Manages complexity", "Ensures accountability", "Plans and aligns",
+]
+
+# teto de números aleatórios por bloco no sorteio das listas
+_SAMPLE_CELLS = 1 << 22
+
+# faixas de grade → letra da Career Level (CAREER_BAND_LEVELS)
+_BAND_EDGES = np.array([6, 9, 13, 17])
+_BAND_LETTERS = np.array(["T", "S", "P", "M", "EX"])
+
+
+def _zipf_weights(n: int) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1)
+    return w / w.sum()
+
+
+def _token_lists(rng: np.random.Generator, counts: np.ndarray, vocab: list[str]) -> np.ndarray:
+    """Uma lista "a, b, c" por linha, `counts[i]` itens distintos de vocab (zipf)."""
+    vocab_arr = np.asarray(vocab, dtype=object)
+    weights = _zipf_weights(len(vocab))
+    out = np.full(len(counts), "", dtype=object)
+    step = max(1, _SAMPLE_CELLS // len(vocab))
+    for size in np.unique(counts[counts > 0]):
+        for start in range(0, int((counts == size).sum()), step):
+            rows = np.flatnonzero(counts == size)[start:start + step]
+            # Gumbel-top-k: amostra ponderada sem reposição, vetorizada por linha
+            keys = np.log(weights)[None, :] - np.log(-np.log(rng.random((len(rows), len(vocab)))))
+            picks = np.argpartition(-keys, size - 1, axis=1)[:, :size]
+            out[rows] = [", ".join(r) for r in vocab_arr[picks]]
+    return out
+
+
+def synthetic_profiles(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    `n` Job Profiles sintéticos com as colunas do motor (MATCH_COLUMNS) +
+    Job Profile e Full Job Code, normalizados como o Job Profile real.
+    """
+    rng = np.random.default_rng(seed)
+
+    # sub-família de cada perfil: pesos gamma → tamanhos variados em torno da média
+    n_subs = max(1, int(round(n / PROFILES_PER_SUB_FAMILY)))
+    weights = rng.gamma(3.0, size=n_subs)
+    sub = np.sort(rng.choice(n_subs, size=n, p=weights / weights.sum()))
+    family = sub // SUB_FAMILIES_PER_FAMILY
+
+    # grade: base da sub-família + variação do perfil
+    base = rng.normal(10.6, 2.0, size=n_subs)
+    grade = np.clip(np.round(base[sub] + rng.normal(0.0, 2.2, size=n)), 2, 21).astype(np.int64)
+    band = np.searchsorted(_BAND_EDGES, grade, side="right")
+    level = _BAND_LETTERS[band].astype(object) + (1 + grade % 4).astype(str).astype(object)
+
+    kpi_counts = np.where(
+        rng.random(n) < KPI_EMPTY_SHARE, 0, np.minimum(rng.geometric(0.35, size=n), 14)
+    )
+    kpis = _token_lists(rng, kpi_counts, KPI_VOCAB)
+    comps = _token_lists(rng, np.full(n, 3), COMPETENCY_VOCAB)
+    comp_cols = np.array([c.split(", ") for c in comps], dtype=object)
+
+    df = pd.DataFrame({
+        "Job Family": pd.Series(family).map("Family {:04d}".format),
+        "Sub Job Family": pd.Series(sub).map("Sub Family {:06d}".format),
+        "Global Grade": grade,
+        "Career Level": level,
+        "Specific parameters / KPIs": kpis,
+        "Competencies 1": comp_cols[:, 0],
+        "Competencies 2": comp_cols[:, 1],
+        "Competencies 3": comp_cols[:, 2],
+        "Job Profile": pd.Series(np.arange(n)).map("Profile {:07d}".format),
+        "Full Job Code": pd.Series(np.arange(n)).map("SYN{:07d}".format),
+    })
+    return normalize_job_profile(df)
+
+
+def synthetic_forms(df_profiles: pd.DataFrame, m: int, seed: int = 0) -> list[dict]:
+    """
+    `m` formulários como os da página do Job Match: família/sub-família de
+    um perfil sorteado, uma opção por campo, 1-3 KPIs e 1-3 competências.
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(df_profiles), size=m)
+    families = df_profiles["Job Family"].astype(str).to_numpy()[rows]
+    subs = df_profiles["Sub Job Family"].astype(str).to_numpy()[rows]
+
+    forms = []
+    for i in range(m):
+        form = {"job_family": families[i], "sub_job_family": subs[i]}
+        for field in SIGNATURE_FIELDS:
+            options = FORM_OPTIONS[field]
+            form[field] = options[rng.integers(len(options))]
+        form["kpis_selected"] = [str(k) for k in rng.choice(KPI_OPTIONS, size=rng.integers(1, 4), replace=False)]
+        form["competencies_selected"] = [
+            str(c) for c in rng.choice(COMPETENCY_OPTIONS, size=rng.integers(1, 4), replace=False)
+        ]
+        forms.append(form)
+    return forms
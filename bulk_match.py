@@ -0,0 +1,223 @@
+# bulk_match.py
+"""
+Match em lote: um arquivo de posições (CSV ou XLSX com os mesmos campos do
+formulário do Job Match) vira um CSV com o(s) Job Profile(s) mais próximo(s)
+de cada posição.
+
+    python -m bulk_match posicoes.xlsx resultado.csv --top-k 3 --workers 2
+
+O arquivo é lido em blocos de `chunksize` linhas e cada bloco é gravado assim
+que fica pronto, então a memória não cresce com o tamanho do arquivo. Com
+`workers > 1` os blocos são pontuados num pool de processos (cada worker lê o
+snapshot do Job Profile e monta o próprio MatchIndex uma vez).
+"""
+import argparse
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+from match_engine import (
+    BATCH_RESULT_COLUMNS,
+    MATCH_COLUMNS,
+    SIGNATURE_FIELDS,
+    MatchIndex,
+    compute_job_matches,
+)
+from utils.data_loader import GRADE_STR, load_dataset, normalize_job_profile
+
+logger = logging.getLogger(__name__)
+
+
+# campos do formulário lidos do arquivo de posições
+FORM_FIELDS = ["job_family", "sub_job_family"] + SIGNATURE_FIELDS + ["kpis_selected", "competencies_selected"]
+
+# colunas do perfil escritas ao lado de cada resultado
+OUTPUT_PROFILE_COLUMNS = ["Job Profile", "Full Job Code", "Global Grade", "Job Family", "Sub Job Family"]
+
+# de onde sai cada coluna de OUTPUT_PROFILE_COLUMNS (grade como texto, sem ".0")
+_PROFILE_SOURCE = ["Job Profile", "Full Job Code", GRADE_STR, "Job Family", "Sub Job Family"]
+
+# rank + scores de compute_job_matches (sem as posições internas)
+_SCORE_COLUMNS = [c for c in BATCH_RESULT_COLUMNS if c not in ("row", "position")]
+
+
+# ==========================================================
+# LEITURA EM BLOCOS
+# ==========================================================
+def iter_positions(path: Path, chunksize: int = 1000) -> Iterator[pd.DataFrame]:
+    """
+    Blocos de até `chunksize` posições, como texto. CSV via pandas (chunksize);
+    XLSX via openpyxl em modo read_only (primeira aba, 1ª linha = cabeçalho).
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        yield from _iter_xlsx(path, chunksize)
+    else:
+        yield from pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunksize)
+
+
+def _iter_xlsx(path: Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else f"col_{i}" for i, h in enumerate(next(rows, ()))]
+        block = []
+        for values in rows:
+            if all(v is None for v in values):
+                continue
+            block.append(["" if v is None else str(v) for v in values])
+            if len(block) == chunksize:
+                yield pd.DataFrame(block, columns=header)
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=header)
+    finally:
+        wb.close()
+
+
+# ==========================================================
+# PERFIS + ÍNDICE (um por processo)
+# ==========================================================
+_STATE: Dict[str, Any] = {}
+
+
+def load_profiles(data_dir: Path | None = None) -> pd.DataFrame:
+    """Job Profile normalizado, só com as colunas do motor e da saída."""
+    columns = list(dict.fromkeys(MATCH_COLUMNS + OUTPUT_PROFILE_COLUMNS))
+    df = load_dataset("job_profile", data_dir, columns=columns)
+    if df is None:
+        raise FileNotFoundError("Job Profile.xlsx não encontrado na pasta data/")
+    return normalize_job_profile(df)
+
+
+def _init_worker(data_dir: Path | None) -> None:
+    profiles = load_profiles(data_dir)
+    _STATE["profiles"] = profiles
+    _STATE["index"] = MatchIndex(profiles)
+
+
+def _with_offsets(chunks: Iterator[pd.DataFrame]) -> Iterator[tuple[pd.DataFrame, int]]:
+    start = 0
+    for chunk in chunks:
+        yield chunk, start
+        start += len(chunk)
+
+
+def _match_chunk(chunk: pd.DataFrame, first_row: int, top_k: int) -> pd.DataFrame:
+    """Pontua um bloco e monta as linhas de saída (roda também nos workers)."""
+    profiles = _STATE["profiles"]
+    chunk = chunk.reset_index(drop=True)
+    matches = compute_job_matches(chunk, _STATE["index"], top_k=top_k)
+
+    # colunas do arquivo que não são campos do formulário (IDs, nomes...) passam direto
+    passthrough = chunk[[c for c in chunk.columns if c not in FORM_FIELDS]]
+    out = pd.DataFrame({"input_row": np.arange(len(chunk)) + first_row + 1}).join(passthrough)
+
+    found = profiles.iloc[matches["position"].to_numpy()][_PROFILE_SOURCE].reset_index(drop=True)
+    found = pd.concat([matches.drop(columns="position"), found.set_axis(OUTPUT_PROFILE_COLUMNS, axis=1)], axis=1)
+    found = found.astype({"rank": "Int64", "score_pct": "Int64"})
+    # posições sem candidatos continuam no arquivo, com o resultado vazio
+    return out.merge(found, left_index=True, right_on="row", how="left").drop(columns="row")
+
+
+# ==========================================================
+# PUBLIC: ARQUIVO → ARQUIVO
+# ==========================================================
+def match_file(
+    source: Path,
+    output: Path,
+    data_dir: Path | None = None,
+    top_k: int = 1,
+    chunksize: int = 1000,
+    workers: int = 1,
+) -> dict:
+    """
+    Lê `source` em blocos, pontua cada posição contra o Job Profile e grava
+    em `output` (CSV) na ordem de entrada, `top_k` linhas por posição.
+
+    Com workers > 1 no máximo 2 blocos por worker ficam em memória ao mesmo
+    tempo. Devolve contagens e throughput (posições/s).
+    """
+    t0 = time.perf_counter()
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    # garante o snapshot antes de abrir os workers (senão cada um faria o parse)
+    load_profiles(data_dir)
+
+    stats = {"positions": 0, "matched": 0, "chunks": 0}
+    first = [True]
+
+    def _write(result: pd.DataFrame, n_rows: int) -> None:
+        result.to_csv(output, mode="w" if first[0] else "a", header=first[0], index=False)
+        first[0] = False
+        stats["positions"] += n_rows
+        stats["matched"] += int(result.loc[result["rank"] == 1].shape[0])
+        stats["chunks"] += 1
+
+    chunks = _with_offsets(iter_positions(source, chunksize))
+
+    if workers <= 1:
+        _init_worker(data_dir)
+        for chunk, start in chunks:
+            _write(_match_chunk(chunk, start, top_k), len(chunk))
+    else:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(data_dir,),
+        )
+        with pool:
+            in_flight: deque = deque()
+            for chunk, start in chunks:
+                in_flight.append((pool.submit(_match_chunk, chunk, start, top_k), len(chunk)))
+                if len(in_flight) >= 2 * workers:
+                    fut, n_rows = in_flight.popleft()
+                    _write(fut.result(), n_rows)
+            while in_flight:
+                fut, n_rows = in_flight.popleft()
+                _write(fut.result(), n_rows)
+
+    if first[0]:  # arquivo de entrada vazio → CSV só com cabeçalho
+        pd.DataFrame(columns=["input_row"] + _SCORE_COLUMNS + OUTPUT_PROFILE_COLUMNS).to_csv(output, index=False)
+
+    seconds = time.perf_counter() - t0
+    stats.update({
+        "workers": max(1, workers),
+        "seconds": round(seconds, 3),
+        "positions_per_s": round(stats["positions"] / seconds, 1) if seconds > 0 else None,
+        "output": str(output),
+    })
+    logger.info("bulk match: %s", stats)
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Job Match em lote (CSV/XLSX de posições → CSV).")
+    parser.add_argument("source", type=Path, help="posições com os campos do formulário do Job Match")
+    parser.add_argument("output", type=Path, help="CSV de saída")
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--top-k", type=int, default=1, help="perfis por posição")
+    parser.add_argument("--chunksize", type=int, default=1000, help="posições por bloco")
+    parser.add_argument("--workers", type=int, default=1, help="processos de pontuação")
+    args = parser.parse_args(argv)
+
+    stats = match_file(args.source, args.output, args.data_dir, args.top_k, args.chunksize, args.workers)
+    print(
+        f"{stats['positions']} posições ({stats['matched']} com match) em {stats['seconds']}s "
+        f"— {stats['positions_per_s']} posições/s, {stats['workers']} worker(s) → {stats['output']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# calibrate_weights.py
+"""
+Calibração dos pesos do score do Job Match (grade / KPIs / competências,
+hoje 0.5 / 0.3 / 0.2 em compute_job_match) contra posições já classificadas.
+
+    python -m calibrate_weights rotuladas.xlsx pesos.csv --step 0.01
+
+O arquivo tem os campos do formulário (como no bulk_match) e a coluna com o
+Full Job Code correto de cada posição. Os três componentes de cada posição
+contra cada candidato da sua sub-família são calculados uma vez, como um
+tensor (posições x candidatos x 3); todas as combinações de pesos da grade
+são avaliadas de uma vez pelo produto desse tensor com a matriz de pesos
+(3 x combinações). Para cada combinação sai a acurácia top-1 e top-3.
+"""
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from bulk_match import iter_positions, load_profiles
+from match_engine import MatchIndex, _as_selection, encode_forms, grade_hints
+
+logger = logging.getLogger(__name__)
+
+
+# pesos atuais do compute_job_match (grade, KPIs, competências)
+CURRENT_WEIGHTS = (0.5, 0.3, 0.2)
+
+# colunas do resultado, uma linha por combinação de pesos
+CALIBRATION_COLUMNS = ["w_grade", "w_kpi", "w_comp", "top1", "top3", "top1_pct", "top3_pct"]
+
+# teto de células (posições x candidatos x combinações) por produto
+_CALIBRATION_CELLS = 1 << 22
+
+
+# ==========================================================
+# GRADE DE PESOS
+# ==========================================================
+def weight_grid(step: float = 0.01) -> np.ndarray:
+    """
+    Todas as combinações (w_grade, w_kpi, w_comp) >= 0 em múltiplos de
+    `step` que somam 1, como matriz (3, n_combinações). Multiplicar os
+    pesos por uma constante não muda o ranking, então o simplex basta.
+    """
+    n = int(round(1 / step))
+    if n < 1 or not np.isclose(n * step, 1.0):
+        raise ValueError("step deve dividir 1 (ex.: 0.01, 0.05, 0.1)")
+    g, k = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    keep = g + k <= n
+    g, k = g[keep], k[keep]
+    return np.stack([g, k, n - g - k]).astype(float) / n
+
+
+# ==========================================================
+# TENSORES DE COMPONENTES + RANK DO RÓTULO
+# ==========================================================
+def _label_ranks(components: np.ndarray, true_idx: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Rank (0 = primeiro) do candidato `true_idx[i]` da posição i para cada
+    combinação de pesos: (posições, combinações). components tem forma
+    (posições, candidatos, 3). Mesmo desempate do motor: em scores iguais
+    o candidato anterior no arquivo vem antes.
+    """
+    scores = components @ weights  # (posições, candidatos, combinações)
+    true = scores[np.arange(len(true_idx)), true_idx][:, None, :]
+    earlier = (np.arange(components.shape[1])[None, :] < true_idx[:, None])[:, :, None]
+    better = (scores > true) | ((scores == true) & earlier)
+    return better.sum(axis=1)
+
+
+def _chunk_counts(
+    chunk: pd.DataFrame,
+    index: MatchIndex,
+    codes: np.ndarray,
+    weights: np.ndarray,
+    label_column: str,
+) -> dict:
+    """Acertos top-1 / top-3 por combinação de pesos num bloco de posições rotuladas."""
+    chunk = chunk.reset_index(drop=True)
+    labels = chunk[label_column].astype("string").str.strip()
+    chunk = chunk[labels.fillna("").ne("").to_numpy()].reset_index(drop=True)
+    labels = chunk[label_column].astype("string").str.strip().to_numpy(dtype=object)
+
+    n_combos = weights.shape[1]
+    counts = {"labeled": len(chunk), "reachable": 0, "top1": np.zeros(n_combos, np.int64), "top3": np.zeros(n_combos, np.int64)}
+    if len(chunk) == 0:
+        return counts
+
+    hints = grade_hints(encode_forms(chunk)).astype(float)
+    empty = pd.Series([None] * len(chunk))
+    kpis = [_as_selection(v) for v in chunk.get("kpis_selected", empty)]
+    comps = [_as_selection(v) for v in chunk.get("competencies_selected", empty)]
+    keys = pd.DataFrame({
+        "jf": chunk.get("job_family", empty).astype("string").str.strip().to_numpy(),
+        "sf": chunk.get("sub_job_family", empty).astype("string").str.strip().to_numpy(),
+    })
+
+    for (jf, sf), rows in keys.groupby(["jf", "sf"], sort=False).indices.items():
+        cand = index.candidates(jf, sf)
+        if len(cand) == 0:
+            continue
+
+        # posição do rótulo entre os candidatos (1ª ocorrência); fora da sub-família = erro certo
+        where = {}
+        for i, code in enumerate(codes[cand]):
+            where.setdefault(code, i)
+        true_idx = np.array([where.get(labels[r], -1) for r in rows])
+        rows, true_idx = rows[true_idx >= 0], true_idx[true_idx >= 0]
+        counts["reachable"] += len(rows)
+
+        step = max(1, _CALIBRATION_CELLS // (len(cand) * n_combos))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            sc = index.score_batch(hints[block], [kpis[i] for i in block], [comps[i] for i in block], cand)
+            components = np.stack([sc["grade"], sc["kpi"], sc["comp"]], axis=-1)
+            ranks = _label_ranks(components, true_idx[start:start + step], weights)
+            counts["top1"] += (ranks < 1).sum(axis=0)
+            counts["top3"] += (ranks < 3).sum(axis=0)
+
+    return counts
+
+
+# ==========================================================
+# PUBLIC: CALIBRAÇÃO
+# ==========================================================
+def calibrate(
+    chunks: Iterator[pd.DataFrame],
+    profiles: pd.DataFrame,
+    index: MatchIndex | None = None,
+    weights: np.ndarray | None = None,
+    label_column: str = "Full Job Code",
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Acurácia top-1 / top-3 de cada combinação de `weights` (3 x n, padrão
+    weight_grid()) sobre as posições rotuladas de `chunks`.
+
+    Devolve (tabela, stats): a tabela tem CALIBRATION_COLUMNS, da melhor
+    combinação (top-1, depois top-3) para a pior; os percentuais são sobre
+    todas as posições rotuladas, inclusive as cujo rótulo não está entre os
+    candidatos da sub-família informada ("reachable" em stats).
+    """
+    t0 = time.perf_counter()
+    index = index if index is not None else MatchIndex(profiles)
+    weights = weight_grid() if weights is None else np.asarray(weights, dtype=float)
+    codes = profiles["Full Job Code"].astype("string").str.strip().to_numpy(dtype=object)
+
+    stats = {"labeled": 0, "reachable": 0, "chunks": 0}
+    top1 = np.zeros(weights.shape[1], np.int64)
+    top3 = np.zeros(weights.shape[1], np.int64)
+    for chunk in chunks:
+        if label_column not in chunk.columns:
+            raise ValueError(f"Missing label column: {label_column}")
+        counts = _chunk_counts(chunk, index, codes, weights, label_column)
+        stats["labeled"] += counts["labeled"]
+        stats["reachable"] += counts["reachable"]
+        stats["chunks"] += 1
+        top1 += counts["top1"]
+        top3 += counts["top3"]
+
+    labeled = max(1, stats["labeled"])
+    table = pd.DataFrame({
+        "w_grade": weights[0], "w_kpi": weights[1], "w_comp": weights[2],
+        "top1": top1, "top3": top3,
+        "top1_pct": np.round(100 * top1 / labeled, 2),
+        "top3_pct": np.round(100 * top3 / labeled, 2),
+    }).sort_values(["top1", "top3"], ascending=False, kind="stable", ignore_index=True)
+
+    stats.update({"combinations": weights.shape[1], "seconds": round(time.perf_counter() - t0, 3)})
+    logger.info("calibração: %s", stats)
+    return table, stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Calibra os pesos do score do Job Match com posições rotuladas.")
+    parser.add_argument("source", type=Path, help="CSV/XLSX com os campos do formulário + o código correto")
+    parser.add_argument("output", type=Path, help="CSV com a acurácia de cada combinação de pesos")
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--label-column", default="Full Job Code", help="coluna com o Full Job Code correto")
+    parser.add_argument("--step", type=float, default=0.01, help="passo da grade de pesos (somam 1)")
+    parser.add_argument("--chunksize", type=int, default=1000, help="posições por bloco")
+    args = parser.parse_args(argv)
+
+    profiles = load_profiles(args.data_dir)
+    table, stats = calibrate(
+        iter_positions(args.source, args.chunksize),
+        profiles,
+        weights=weight_grid(args.step),
+        label_column=args.label_column,
+    )
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(args.output, index=False)
+
+    current = table[np.isclose(table[["w_grade", "w_kpi", "w_comp"]], CURRENT_WEIGHTS).all(axis=1)]
+    best = table.iloc[0]
+    print(
+        f"{stats['labeled']} posições rotuladas ({stats['reachable']} com o código entre os candidatos), "
+        f"{stats['combinations']} combinações em {stats['seconds']}s → {args.output}"
+    )
+    print(
+        f"melhor: {best.w_grade:g} / {best.w_kpi:g} / {best.w_comp:g} — "
+        f"top-1 {best.top1_pct}%, top-3 {best.top3_pct}%"
+    )
+    if len(current):
+        now = current.iloc[0]
+        print(f"atual:  0.5 / 0.3 / 0.2 — top-1 {now.top1_pct}%, top-3 {now.top3_pct}%")
+
+
+if __name__ == "__main__":
+    main()
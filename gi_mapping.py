@@ -0,0 +1,279 @@
+# gi_mapping.py
+"""
+Mapeamento GI Position Descriptions → Job Profiles: para cada posição, os
+Job Profiles de texto mais parecido (TF-IDF do text_match), gravados como
+uma tabela ranqueada em CSV.
+
+    python -m gi_mapping gi_to_profiles.csv --top-k 5
+    python -m gi_mapping out.csv --positions posicoes.csv --text-columns Title Description
+
+A similaridade é calculada em blocos: `chunksize` posições contra
+`profile_block` perfis por vez, com um top-K acumulado por posição. A memória
+fica em O(chunksize x (profile_block + top_k)), qualquer que seja o tamanho
+de cada lado, e cada bloco de posições é gravado assim que termina.
+"""
+import argparse
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from bulk_match import iter_positions
+from text_match import TEXT_COLUMNS, TextIndex, load_text_index
+from utils.data_loader import GRADE_STR, load_dataset, normalize_job_profile
+
+logger = logging.getLogger(__name__)
+
+
+# colunas do perfil escritas ao lado de cada par
+OUTPUT_PROFILE_COLUMNS = ["Full Job Code", "Job Profile", "Job Family", "Sub Job Family", "Global Grade"]
+
+
+# ==========================================================
+# POSIÇÕES DO GI
+# ==========================================================
+def load_gi_positions(data_dir: Path | None = None) -> pd.DataFrame:
+    """
+    Disciplinas do GI Position Descriptions.xlsx, uma linha por código:
+    gi_code, gi_title, gi_function e text (título + descrição + notas de
+    matching da disciplina).
+
+    A planilha tem um cabeçalho de copyright antes da linha "Type"; o
+    cabeçalho real é localizado pela 1ª coluna.
+    """
+    raw = load_dataset("gi_position_descriptions", data_dir)
+    if raw is None:
+        raise FileNotFoundError("GI Position Descriptions.xlsx não encontrado na pasta data/")
+
+    first = raw.iloc[:, 0].astype("string").str.strip()
+    header_rows = np.flatnonzero((first == "Type").to_numpy(na_value=False))
+    if len(header_rows) == 0:
+        raise ValueError("GI Position Descriptions: linha de cabeçalho 'Type' não encontrada")
+    h = header_rows[0]
+    body = raw.iloc[h + 1:].copy()
+    body.columns = [str(c).strip() for c in raw.iloc[h]]
+
+    kind = body["Type"].astype("string").str.strip()
+    code = body["2022 Code"].astype("string").str.strip()
+    desc = body["2022 Description"].astype("string").fillna("")
+
+    disciplines = body[(kind == "Discipline").to_numpy(na_value=False)]
+    notes = (
+        desc[(kind == "Discipline Matching Note").to_numpy(na_value=False)]
+        .groupby(code[(kind == "Discipline Matching Note").to_numpy(na_value=False)])
+        .agg("\n".join)
+    )
+
+    d_code = disciplines["2022 Code"].astype("string").str.strip()
+    title = disciplines["2022 Title"].astype("string").fillna("")
+    text = title + "\n" + disciplines["2022 Description"].astype("string").fillna("")
+    text = text + "\n" + d_code.map(notes).fillna("")
+
+    return pd.DataFrame({
+        "gi_code": d_code.to_numpy(),
+        "gi_title": title.to_numpy(),
+        "gi_function": disciplines["2022 Function Title"].astype("string").fillna("").to_numpy(),
+        "text": text.to_numpy(),
+    })
+
+
+def iter_position_file(path: Path, text_columns: list[str], chunksize: int) -> Iterator[pd.DataFrame]:
+    """Arquivo de posições (CSV/XLSX) em blocos, com `text` = colunas de texto concatenadas."""
+    for chunk in iter_positions(path, chunksize):
+        missing = [c for c in text_columns if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing text columns in {path}: {', '.join(missing)}")
+        chunk = chunk.copy()
+        chunk["text"] = chunk[text_columns].astype("string").fillna("").agg("\n".join, axis=1)
+        yield chunk
+
+
+# ==========================================================
+# TOP-K EM BLOCOS
+# ==========================================================
+def _top_k_blocked(
+    queries, profiles, k: int, profile_block: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k perfis por linha de `queries` (CSR, linhas com norma L2) contra
+    `profiles` (CSR), percorrendo os perfis em blocos. Devolve (posições,
+    scores), (n_queries, k), do melhor para o pior; empate → menor posição.
+    """
+    n_q, n_p = queries.shape[0], profiles.shape[0]
+    k = min(k, n_p)
+    best_pos = np.empty((n_q, 0), dtype=np.intp)
+    best_score = np.empty((n_q, 0), dtype=np.float32)
+
+    for start in range(0, n_p, profile_block):
+        block = profiles[start:start + profile_block]
+        sims = (queries @ block.T).toarray()
+
+        # candidatos do bloco: ordenação estável (empate → ordem do arquivo)
+        take = np.argsort(-sims, axis=1, kind="stable")[:, :k]
+        pos = np.concatenate([best_pos, take + start], axis=1)
+        score = np.concatenate([best_score, np.take_along_axis(sims, take, axis=1)], axis=1)
+
+        # junta com o acumulado (que vem de blocos anteriores = posições menores)
+        keep = np.argsort(-score, axis=1, kind="stable")[:, :k]
+        best_pos = np.take_along_axis(pos, keep, axis=1)
+        best_score = np.take_along_axis(score, keep, axis=1)
+
+    return best_pos, best_score
+
+
+# ==========================================================
+# PUBLIC: PIPELINE
+# ==========================================================
+def load_profiles(data_dir: Path | None = None) -> pd.DataFrame:
+    """Job Profile normalizado com as colunas do índice de texto e da saída."""
+    columns = list(dict.fromkeys(TEXT_COLUMNS + OUTPUT_PROFILE_COLUMNS + ["Discipline Code"]))
+    df = load_dataset("job_profile", data_dir, columns=columns)
+    if df is None:
+        raise FileNotFoundError("Job Profile.xlsx não encontrado na pasta data/")
+    return normalize_job_profile(df)
+
+
+def map_positions(
+    chunks: Iterator[pd.DataFrame],
+    output: Path,
+    profiles: pd.DataFrame,
+    index: TextIndex,
+    top_k: int = 5,
+    profile_block: int = 2048,
+    code_column: str | None = None,
+    trace_memory: bool = False,
+) -> dict:
+    """
+    Pontua cada bloco de posições (DataFrame com `text` + colunas de
+    identificação) contra todos os perfis e grava `top_k` linhas por posição
+    em `output` (CSV), bloco a bloco.
+
+    Com `code_column`, compara o código da posição com o Discipline Code do
+    1º perfil ("top1_same_discipline"). `trace_memory` liga o tracemalloc
+    para medir o pico alocado pelo pipeline (mais lento).
+    """
+    if not index.aligned_with(profiles):
+        raise ValueError("TextIndex was built for a different Job Profile dataset")
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if trace_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+
+    prof = profiles.reset_index(drop=True)
+    prof_out = prof[OUTPUT_PROFILE_COLUMNS].copy()
+    prof_out["Global Grade"] = prof[GRADE_STR] if GRADE_STR in prof.columns else prof["Global Grade"]
+    discipline = prof["Discipline Code"].astype("string").str.strip().to_numpy(dtype=object) \
+        if "Discipline Code" in prof.columns else None
+
+    stats = {"positions": 0, "pairs_scored": 0, "chunks": 0, "top1_same_discipline": 0, "with_code": 0}
+    first = True
+
+    for chunk in chunks:
+        chunk = chunk.reset_index(drop=True)
+        queries = index.vectorizer.transform(chunk["text"].astype("string").fillna("").tolist())
+        pos, score = _top_k_blocked(queries, index.matrix, top_k, profile_block)
+        width = pos.shape[1]
+
+        ids = chunk.drop(columns="text").loc[np.repeat(np.arange(len(chunk)), width)].reset_index(drop=True)
+        pairs = prof_out.iloc[pos.ravel()].reset_index(drop=True)
+        result = pd.concat([ids, pd.DataFrame({
+            "rank": np.tile(np.arange(1, width + 1), len(chunk)),
+            "score": np.round(score.ravel().astype(float), 4),
+        }), pairs], axis=1)
+
+        if code_column and discipline is not None:
+            codes = chunk[code_column].astype("string").str.strip().to_numpy(dtype=object)
+            known = np.isin(codes, discipline)
+            same = discipline[pos[:, 0]] == codes
+            stats["with_code"] += int(known.sum())
+            stats["top1_same_discipline"] += int((same & known).sum())
+            result["same_discipline"] = (discipline[pos.ravel()] == np.repeat(codes, width))
+
+        result.to_csv(output, mode="w" if first else "a", header=first, index=False)
+        first = False
+        stats["positions"] += len(chunk)
+        stats["pairs_scored"] += len(chunk) * index.n
+        stats["chunks"] += 1
+
+    seconds = time.perf_counter() - t0
+    stats.update({
+        "profiles": index.n,
+        "seconds": round(seconds, 3),
+        "positions_per_s": round(stats["positions"] / seconds, 1) if seconds > 0 else None,
+        "pairs_per_s": round(stats["pairs_scored"] / seconds) if seconds > 0 else None,
+        "max_rss_mb": round(_max_rss_mb(), 1),
+        "output": str(output),
+    })
+    if trace_memory:
+        stats["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        tracemalloc.stop()
+    if stats["with_code"]:
+        stats["top1_same_discipline_pct"] = round(100 * stats["top1_same_discipline"] / stats["with_code"], 1)
+    logger.info("gi mapping: %s", stats)
+    return stats
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024  # bytes no macOS, KiB no Linux
+
+
+def _chunked(df: pd.DataFrame, chunksize: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Mapeia posições (GI ou arquivo próprio) para Job Profiles.")
+    parser.add_argument("output", type=Path, help="CSV de saída (uma linha por posição x rank)")
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--positions", type=Path, default=None, help="CSV/XLSX de posições (padrão: GI do data/)")
+    parser.add_argument("--text-columns", nargs="+", default=None, help="colunas de texto do --positions")
+    parser.add_argument("--code-column", default=None, help="código da posição comparado ao Discipline Code")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--chunksize", type=int, default=256, help="posições por bloco")
+    parser.add_argument("--profile-block", type=int, default=2048, help="perfis por bloco")
+    parser.add_argument("--trace-memory", action="store_true", help="pico de memória via tracemalloc")
+    args = parser.parse_args(argv)
+
+    profiles = load_profiles(args.data_dir)
+    index = load_text_index(profiles, args.data_dir)
+
+    if args.positions is None:
+        chunks = _chunked(load_gi_positions(args.data_dir), args.chunksize)
+        code_column = args.code_column or "gi_code"
+    else:
+        if not args.text_columns:
+            parser.error("--positions exige --text-columns")
+        chunks = iter_position_file(args.positions, args.text_columns, args.chunksize)
+        code_column = args.code_column
+
+    stats = map_positions(
+        chunks, args.output, profiles, index,
+        top_k=args.top_k,
+        profile_block=args.profile_block,
+        code_column=code_column,
+        trace_memory=args.trace_memory,
+    )
+    line = (
+        f"{stats['positions']} posições x {stats['profiles']} perfis em {stats['seconds']}s — "
+        f"{stats['positions_per_s']} posições/s, {stats['pairs_per_s']} pares/s, "
+        f"pico RSS {stats['max_rss_mb']} MB"
+    )
+    if "peak_traced_mb" in stats:
+        line += f", pico alocado {stats['peak_traced_mb']} MB"
+    if "top1_same_discipline_pct" in stats:
+        line += f", top-1 com a mesma disciplina: {stats['top1_same_discipline_pct']}%"
+    print(f"{line} → {stats['output']}")
+
+
+if __name__ == "__main__":
+    main()
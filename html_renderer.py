@@ -2,33 +2,36 @@
 import html
 import os
 import pandas as pd
+from string import Template
 from typing import Dict
 
+from utils.lru_cache import LRUCache
+from utils.svg_sprite import SvgSprite
+from utils.timing import span, timed
+
 # ---------------------------------------------------------
-# Carrega SVG
+# Ícones SVG: sprite de assets/icons/sig/, lido uma vez
 # ---------------------------------------------------------
-def load_svg(svg_name: str) -> str:
-    path = os.path.join("assets", "icons", "sig", svg_name)
-    if not os.path.exists(path):
-        return ""
-    with open(path, "r", encoding="utf-8") as f:
-        svg = f.read()
-        svg = svg.replace('<?xml version="1.0" encoding="utf-8"?>', '')
-        return svg
-
-ICONS_SVG: Dict[str, str] = {
-    "Sub Job Family Description": load_svg("Hierarchy.svg"),
-    "Job Profile Description": load_svg("Content_Book_Phone.svg"),
-    "Career Band Description": load_svg("File_Clipboard_Text.svg"),
-    "Role Description": load_svg("Shopping_Business_Target.svg"),
-    "Grade Differentiator": load_svg("User_Add.svg"),
-    "Qualifications": load_svg("Edit_Pencil.svg"),
-    "Specific parameters / KPIs": load_svg("Graph_Bar.svg"),
-    "Competencies 1": load_svg("Setting_Cog.svg"),
-    "Competencies 2": load_svg("Setting_Cog.svg"),
-    "Competencies 3": load_svg("Setting_Cog.svg"),
+SPRITE = SvgSprite(os.path.join("assets", "icons", "sig"))
+
+# arquivo do ícone de cada seção
+SECTION_ICONS: Dict[str, str] = {
+    "Sub Job Family Description": "Hierarchy.svg",
+    "Job Profile Description": "Content_Book_Phone.svg",
+    "Career Band Description": "File_Clipboard_Text.svg",
+    "Role Description": "Shopping_Business_Target.svg",
+    "Grade Differentiator": "User_Add.svg",
+    "Qualifications": "Edit_Pencil.svg",
+    "Specific parameters / KPIs": "Graph_Bar.svg",
+    "Competencies 1": "Setting_Cog.svg",
+    "Competencies 2": "Setting_Cog.svg",
+    "Competencies 3": "Setting_Cog.svg",
 }
 
+# por seção, só o <use>; os <symbol> vão uma vez por documento (ICON_DEFS)
+ICONS_SVG: Dict[str, str] = {sec: SPRITE.use(name) for sec, name in SECTION_ICONS.items()}
+ICON_DEFS = SPRITE.defs(SECTION_ICONS.values())
+
 SECTIONS_ORDER = [
     "Sub Job Family Description",
     "Job Profile Description",
@@ -42,31 +45,22 @@ SECTIONS_ORDER = [
     "Competencies 3",
 ]
 
+# Colunas do Job Profile lidas pelo renderer (projeção via utils.data_loader)
+RENDER_COLUMNS = [
+    "Job Profile",
+    "Global Grade",
+    "Job Family",
+    "Sub Job Family",
+    "Career Path",
+    "Full Job Code",
+] + SECTIONS_ORDER
+
 
 # =====================================================================
-# FUNÇÃO PRINCIPAL
+# TEMPLATES (montados uma vez, na importação)
 # =====================================================================
-def render_job_description(best_match_row: pd.Series, final_score: float) -> str:
-
-    def safe_get(col):
-        try:
-            val = best_match_row.get(col, "")
-            if pd.isna(val):
-                return ""
-            return str(val)
-        except:
-            return ""
-
-    job_title = html.escape(safe_get("Job Profile"))
-    gg = html.escape(safe_get("Global Grade"))
-    jf = html.escape(safe_get("Job Family"))
-    sf = html.escape(safe_get("Sub Job Family"))
-    cp = html.escape(safe_get("Career Path"))
-    fc = html.escape(safe_get("Full Job Code"))
-
-    out = []
-
-    out.append("""
+# CSS do card: texto fixo, igual em toda renderização
+JOB_CARD_CSS = """
 <style>
 body {
     background: #ffffff !important;
@@ -157,42 +151,148 @@ html, body {
 }
 
 </style>
-""")
+"""
+
+class CompiledTemplate:
+    """
+    string.Template analisado uma vez: trechos literais + posições dos
+    placeholders. render() só encaixa os valores (já como texto) e faz um
+    único join, sem regex por chamada.
+    """
+
+    def __init__(self, template: Template):
+        text = template.template
+        self.parts: list[str] = []
+        self.slots: list[tuple[int, str]] = []
+        literal, pos = [], 0
+        for m in template.pattern.finditer(text):
+            literal.append(text[pos:m.start()])
+            pos = m.end()
+            if m.group("escaped") is not None:
+                literal.append(template.delimiter)
+                continue
+            name = m.group("named") or m.group("braced")
+            if name is None:
+                raise ValueError(f"placeholder inválido na posição {m.start()}")
+            self.parts.append("".join(literal))
+            self.slots.append((len(self.parts), name))
+            self.parts.append("")
+            literal = []
+        literal.append(text[pos:])
+        self.parts.append("".join(literal))
+
+    @property
+    def names(self) -> list[str]:
+        return [name for _, name in self.slots]
 
-    # topo
-    out.append("<div class='job-card'>")
+    def render(self, values: Dict[str, str]) -> str:
+        parts = self.parts.copy()
+        for i, name in self.slots:
+            parts[i] = values[name]
+        return "".join(parts)
 
-    out.append(f"""
-        <div class="job-title">{job_title}</div>
+
+# topo do card; os valores chegam já escapados
+_HEADER = """
+        <div class="job-title">$job_title</div>
 
         <div class="job-subtitle">
-            GG {gg} • Job Match
-            <span class="pill">{final_score}%</span>
+            GG $gg • Job Match
+            <span class="pill">$final_score%</span>
         </div>
 
         <div class="meta-card">
-            <b>Job Family:</b> {jf}<br>
-            <b>Sub Job Family:</b> {sf}<br>
-            <b>Career Path:</b> {cp}<br>
-            <b>Full Job Code:</b> {fc}
+            <b>Job Family:</b> $jf<br>
+            <b>Sub Job Family:</b> $sf<br>
+            <b>Career Path:</b> $cp<br>
+            <b>Full Job Code:</b> $fc
         </div>
-    """)
-
-    out.append("</div>")
+    """
 
-    # seções completas (mesmo se vazias!)
-    for sec in SECTIONS_ORDER:
-        raw_text = safe_get(sec)
-        icon_svg = ICONS_SVG.get(sec, "")
-
-        out.append(f"""
+# uma seção; ícone e título são fixos por seção, o texto vira $text_<i>
+_SECTION = Template("""
             <div class="section-box">
                 <div class="section-title">
-                    {icon_svg} {html.escape(sec)}
+                    $icon $title
                 </div>
                 <div class="section-line"></div>
-                <div class="section-text">{html.escape(raw_text)}</div>
+                <div class="section-text">$text</div>
             </div>
         """)
 
-    return "\n".join(out)
+# documento inteiro: CSS + símbolos dos ícones + topo + as seções de
+# SECTIONS_ORDER com ícone e título já embutidos. Sobram só os valores do perfil ($job_title, ..., $text_<i>).
+_PAGE = CompiledTemplate(Template("\n".join(
+    [JOB_CARD_CSS.replace("$", "$$"), ICON_DEFS.replace("$", "$$"), "<div class='job-card'>", _HEADER, "</div>"]
+    + [
+        _SECTION.safe_substitute(
+            icon=ICONS_SVG.get(sec, "").replace("$", "$$"),
+            title=html.escape(sec).replace("$", "$$"),
+            text=f"$text_{i}",
+        )
+        for i, sec in enumerate(SECTIONS_ORDER)
+    ]
+)))
+
+# coluna do perfil de cada placeholder do topo
+_HEADER_FIELDS = {
+    "job_title": "Job Profile",
+    "gg": "Global Grade",
+    "jf": "Job Family",
+    "sf": "Sub Job Family",
+    "cp": "Career Path",
+    "fc": "Full Job Code",
+}
+
+
+def _text(values: Dict, col: str) -> str:
+    """Valor da coluna como texto ("" se ausente/NA)."""
+    val = values.get(col, "")
+    try:
+        if pd.isna(val):
+            return ""
+    except (TypeError, ValueError):
+        return ""
+    return str(val)
+
+
+# HTML já renderizado, compartilhado por todas as sessões do processo.
+# Chaves: ("job_description", Full Job Code, versão do Job Profile, score) e
+# ("comparison", Full Job Codes, versão) da página 3. Com a versão na chave,
+# o HTML de um .xlsx antigo nunca é servido e sai do cache pelo LRU.
+RENDER_CACHE = LRUCache(maxsize=512)
+
+
+# =====================================================================
+# FUNÇÃO PRINCIPAL
+# =====================================================================
+@timed("render.total")
+def render_job_description(
+    best_match_row: pd.Series, final_score: float, data_version: int | None = None
+) -> str:
+    """
+    Card HTML do perfil. Com `data_version` (repo.version("job_profile")
+    lida antes de carregar o frame da linha), o resultado vem de / vai para
+    RENDER_CACHE pelo Full Job Code; sem ela, sempre renderiza.
+    """
+    code = best_match_row.get("Full Job Code") if data_version is not None else None
+    if not isinstance(code, str) or not code:
+        return _render_job_description(best_match_row, final_score)
+    return RENDER_CACHE.get_or_compute(
+        ("job_description", code, data_version, final_score),
+        lambda: _render_job_description(best_match_row, final_score),
+    )
+
+
+def _render_job_description(best_match_row: pd.Series, final_score: float) -> str:
+    # dict puro: bem mais barato que Series.get / to_dict coluna a coluna
+    row = dict(zip(best_match_row.index.tolist(), best_match_row.tolist()))
+
+    with span("render.fill"):
+        values = {name: html.escape(_text(row, col)) for name, col in _HEADER_FIELDS.items()}
+        values["final_score"] = str(final_score)
+        # seções completas (mesmo se vazias!)
+        for i, sec in enumerate(SECTIONS_ORDER):
+            values[f"text_{i}"] = html.escape(_text(row, sec))
+
+    return _PAGE.render(values)
@@ -1,147 +1,541 @@
 # match_engine.py
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 
+from utils.data_loader import GRADE_NUM
+from utils.timing import span, timed
+
+
+# Colunas do Job Profile lidas pelo motor (projeção via utils.data_loader)
+MATCH_COLUMNS = [
+    "Job Family",
+    "Sub Job Family",
+    "Global Grade",
+    "Career Level",
+    "Specific parameters / KPIs",
+    "Competencies 1",
+    "Competencies 2",
+    "Competencies 3",
+]
 
 # ==========================================================
-# HELPERS
+# FORM ENCODERS (um por campo do formulário, compilados no import)
 # ==========================================================
-def _encode_map() -> Dict[str, int]:
-    return {
-        "Choose option": 0,
-
-        # JOB CATEGORY
+# campo do formulário → {opção: código}, na ordem em que a página exibe
+FORM_ENCODERS: Dict[str, Dict[str, int]] = {
+    "job_category": {
         "Executive": 5, "Manager": 4, "Professional": 3,
         "Technical Support": 2, "Business Support": 2, "Production": 1,
-
-        # GEOGRAPHIC SCOPE
-        "Local": 1, "Regional": 2, "Multi-country": 3, "Global": 4,
-
-        # ORG IMPACT
+    },
+    "geo_scope": {"Local": 1, "Regional": 2, "Multi-country": 3, "Global": 4},
+    "org_impact": {
         "Team": 1, "Department / Subfunction": 2,
         "Function": 3, "Business Unit": 4, "Enterprise-wide": 5,
-
-        # SPAN OF CONTROL
+    },
+    "span_control": {
         "No direct reports": 1, "Supervises team": 2, "Leads professionals": 3,
         "Leads multiple teams": 4, "Leads managers": 5,
-
-        # NATURE OF WORK
+    },
+    "nature_work": {
         "Process-oriented": 1, "Analysis-oriented": 2,
         "Specialist": 3, "Leadership-driven": 4,
-
-        # FINANCIAL IMPACT
+    },
+    "financial_impact": {
         "No impact": 1, "Cost center impact": 2,
         "Department-level impact": 3, "Business Unit impact": 4,
         "Company-wide impact": 5,
-
-        # STAKEHOLDERS
+    },
+    "stakeholder_complexity": {
         "Internal team": 1, "Cross-functional": 2,
         "External vendors": 3, "Customers": 4, "Regulatory/Authorities": 5,
-
-        # DECISION TYPE
-        "Procedural": 1, "Operational": 2, "Tactical": 3, "Strategic": 4,
-
-        # DECISION HORIZON
+    },
+    "decision_type": {"Procedural": 1, "Operational": 2, "Tactical": 3, "Strategic": 4},
+    "decision_horizon": {
         "Daily": 1, "Weekly": 2, "Monthly": 3,
         "Annual": 4, "Multi-year": 5,
-
-        # AUTONOMY
+    },
+    "autonomy": {
         "Close supervision": 1, "Regular guidance": 2, "Independent": 3,
         "Sets direction for others": 4, "Defines strategy": 5,
-
-        # PROBLEM SOLVING
+    },
+    "problem_solving": {
         "Routine/Standardized": 1, "Moderate": 2,
         "Complex": 3, "Ambiguous/Novel": 4, "Organization-level": 5,
-
-        # KNOWLEDGE DEPTH
+    },
+    "knowledge_depth": {
         "Entry-level knowledge": 1, "Applied knowledge": 2,
         "Advanced expertise": 3, "Recognized expert": 4, "Thought leader": 5,
-
-        # OPERATIONAL COMPLEXITY
+    },
+    "operational_complexity": {
         "Stable operations": 1, "Some variability": 2,
         "Complex operations": 3, "High-variability environment": 4,
-
-        # INFLUENCE
+    },
+    "influence_level": {
         "Team": 1, "Cross-team": 2, "Multi-function": 3,
         "External vendors/clients": 4, "Industry-level influence": 5,
-
-        # SPECIALIZATION LEVEL
-        "Generalist": 1, "Specialist": 2, "Deep Specialist": 3,
-
-        # INNOVATION RESPONSIBILITY
+    },
+    "education": {
+        "High School": 1, "Technical Degree": 2, "Bachelor’s": 3,
+        "Post-graduate": 4, "Master’s": 5, "Doctorate": 6,
+    },
+    "experience": {
+        "< 2 years": 1, "2–5 years": 2, "5–10 years": 3,
+        "10–15 years": 4, "15+ years": 5,
+    },
+    "specialization_level": {"Generalist": 1, "Specialist": 2, "Deep Specialist": 3},
+    "innovation_resp": {
         "Execution": 1,
         "Incremental improvements": 2,
         "Major improvements": 3,
         "Innovation leadership": 4,
-
-        # LEADERSHIP TYPE
+    },
+    "leadership_type": {
         "None": 1, "Team Lead": 2, "Supervisor": 3,
         "Manager": 4, "Senior Manager": 5, "Director": 6,
-
-        # ORGANIZATIONAL INFLUENCE
+    },
+    "org_influence": {
         "Team": 1, "Department": 2,
         "Business Unit": 3, "Function": 4, "Enterprise-wide": 5,
+    },
+}
 
-        # EDUCATION
-        "High School": 1, "Technical Degree": 2, "Bachelor’s": 3,
-        "Post-graduate": 4, "Master’s": 5, "Doctorate": 6,
+# opções exibidas pela página (sem o "Choose option", que sempre codifica 0)
+FORM_OPTIONS: Dict[str, List[str]] = {field: list(codes) for field, codes in FORM_ENCODERS.items()}
 
-        # EXPERIENCE
-        "< 2 years": 1, "2–5 years": 2, "5–10 years": 3,
-        "10–15 years": 4, "15+ years": 5,
-    }
+KPI_OPTIONS = [
+    "Financial",
+    "Customer",
+    "Operational",
+    "Quality",
+    "Safety",
+    "Compliance",
+    "Project Delivery",
+    "People Leadership",
+]
+
+COMPETENCY_OPTIONS = [
+    "Communication",
+    "Collaboration",
+    "Analytical Thinking",
+    "Technical Expertise",
+    "Leadership",
+    "Innovation",
+    "Strategic Thinking",
+    "Customer Orientation",
+]
+
+# colunas da assinatura numérica, na ordem de encode_forms()
+SIGNATURE_FIELDS = list(FORM_ENCODERS)
+
+# sinais de senioridade usados para estimar o grade do usuário
+GRADE_HINT_FIELDS = ["leadership_type", "org_influence", "org_impact", "span_control", "geo_scope"]
+_GRADE_HINT_COLS = np.array([SIGNATURE_FIELDS.index(f) for f in GRADE_HINT_FIELDS])
+
+
+class _FieldEncoder:
+    """Opções de um campo como pd.Index + tabela de códigos (último = 0 para desconhecidos)."""
 
+    def __init__(self, codes: Dict[str, int]):
+        self.table = dict(codes)
+        self.options = pd.Index(list(codes))
+        self.codes = np.array(list(codes.values()) + [0], dtype=np.int64)
 
-def _enc(x: Any, emap: Dict[str, int]) -> int:
-    return emap.get(x, 0)
+    def encode(self, values) -> np.ndarray:
+        # get_indexer → -1 para "Choose option"/vazio/desconhecido → último código (0)
+        return self.codes[self.options.get_indexer(values)]
 
 
+_ENCODERS: Dict[str, _FieldEncoder] = {field: _FieldEncoder(codes) for field, codes in FORM_ENCODERS.items()}
+
+
+def encode_form(form_inputs: Dict[str, Any]) -> np.ndarray:
+    """Numeric signature of one form, in SIGNATURE_FIELDS order (0 = not chosen)."""
+    return np.array(
+        [_ENCODERS[f].table.get(form_inputs.get(f), 0) for f in SIGNATURE_FIELDS],
+        dtype=np.int64,
+    )
+
+
+def encode_forms(forms: pd.DataFrame | List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Numeric signatures of many forms at once: (n_forms, len(SIGNATURE_FIELDS))
+    int array, one vectorized lookup per field. Missing fields encode as 0.
+    """
+    frame = forms if isinstance(forms, pd.DataFrame) else pd.DataFrame.from_records(forms)
+    out = np.zeros((len(frame), len(SIGNATURE_FIELDS)), dtype=np.int64)
+    for j, field in enumerate(SIGNATURE_FIELDS):
+        if field in frame.columns:
+            out[:, j] = _ENCODERS[field].encode(frame[field])
+    return out
+
+
+def canonical_form(form_inputs: Dict[str, Any]) -> tuple:
+    """
+    Hashable key for a form: (field, value) pairs sorted by field, with the
+    multiselect lists sorted, so the same choices in any order give the same key.
+    """
+    return tuple(
+        (field, tuple(sorted(value)) if isinstance(value, (list, tuple, set)) else value)
+        for field, value in sorted(form_inputs.items())
+    )
+
+
+def grade_hints(signatures: np.ndarray) -> np.ndarray:
+    """User grade estimate: mean of the seniority fields of each signature."""
+    return signatures[..., _GRADE_HINT_COLS].sum(axis=-1) / 5.0
+
+
+# ==========================================================
+# HELPERS
+# ==========================================================
 def _clean_list(x: Any) -> List[str]:
     if pd.isna(x):
         return []
     return [i.strip() for i in str(x).split(",") if i.strip()]
 
 
-def _overlap(a: List[str], b: List[str]) -> float:
-    """Jaccard similarity between two lists."""
-    sa, sb = set(a), set(b)
-    if not sa and not sb:
+def _token_bitsets(*columns: pd.Series) -> tuple[np.ndarray, Dict[str, int]]:
+    """
+    Parses the comma-separated lists of each profile (union over the given
+    columns, same parsing as _clean_list) into integer bitsets.
+
+    Returns (bits, vocab): bits has shape (n_profiles, n_words) uint64, where
+    token `t` is bit vocab[t] of the profile's mask.
+    """
+    vocab: Dict[str, int] = {}
+    rows: List[int] = []
+    ids: List[int] = []
+    for pos, cells in enumerate(zip(*columns)):
+        for cell in cells:
+            for tok in _clean_list(cell):
+                rows.append(pos)
+                ids.append(vocab.setdefault(tok, len(vocab)))
+
+    n_words = max(1, -(-len(vocab) // 64))
+    bits = np.zeros((len(columns[0]), n_words), dtype=np.uint64)
+    if ids:
+        ids_arr = np.asarray(ids, dtype=np.uint64)
+        # OR acumulado por (perfil, palavra); repetidos no mesmo perfil não mudam a máscara
+        np.bitwise_or.at(
+            bits,
+            (np.asarray(rows, dtype=np.intp), (ids_arr // 64).astype(np.intp)),
+            np.left_shift(np.uint64(1), ids_arr % np.uint64(64)),
+        )
+    return bits, vocab
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Number of set bits along the last axis of a (..., n_words) uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(*words.shape[:-1], -1)
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+def _user_mask(selected: List[str], vocab: Dict[str, int], n_words: int) -> np.ndarray:
+    mask = np.zeros((1, n_words), dtype=np.uint64)
+    for tok in set(selected):
+        bit = vocab.get(tok)
+        if bit is not None:
+            mask[0, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+    return mask
+
+
+def _as_selection(x: Any) -> List[str]:
+    """Multiselect value as a list: lists from the UI, comma-separated text from files."""
+    if isinstance(x, (list, tuple, set, np.ndarray)):
+        return [str(i).strip() for i in x if str(i).strip()]
+    return _clean_list(x)
+
+
+def _jaccard_bits(bits: np.ndarray, sizes: np.ndarray, selected: List[str], vocab: Dict[str, int]) -> np.ndarray:
+    """
+    Jaccard similarity between `selected` and every profile bitset, as
+    popcounts (0.0 when both sets are empty). Tokens of `selected` that no
+    profile uses still count in the union.
+    """
+    inter = _popcount(bits & _user_mask(selected, vocab, bits.shape[1]))
+    union = sizes + len(set(selected)) - inter
+    out = np.zeros(len(bits), dtype=float)
+    np.divide(inter, union, out=out, where=union > 0)
+    return out
+
+
+def _jaccard_cap(selected: List[str], vocab: Dict[str, int]) -> float:
+    """
+    Upper bound of _jaccard_bits over any profile: the intersection only holds
+    tokens some profile uses, and the union always holds the whole selection.
+    """
+    tokens = set(selected)
+    if not tokens:
         return 0.0
-    return len(sa & sb) / len(sa | sb)
+    return sum(tok in vocab for tok in tokens) / len(tokens)
 
 
-def _grade_from_row(row: Any) -> Optional[float]:
-    """Try to extract a numeric grade/level from the profile row."""
-    gg = None
-    try:
-        gg = float(row.get("Global Grade"))
-    except Exception:
-        gg = None
+def _jaccard_bits_many(
+    bits: np.ndarray, sizes: np.ndarray, selections: List[List[str]], vocab: Dict[str, int]
+) -> np.ndarray:
+    """_jaccard_bits for several selections at once: (n_selections, n_profiles)."""
+    masks = np.concatenate([_user_mask(s, vocab, bits.shape[1]) for s in selections])
+    inter = _popcount(bits[None, :, :] & masks[:, None, :])
+    union = sizes[None, :] + np.array([len(set(s)) for s in selections])[:, None] - inter
+    out = np.zeros(inter.shape, dtype=float)
+    np.divide(inter, union, out=out, where=union > 0)
+    return out
 
-    if gg:
-        return gg
 
-    # fallback: try career level if it is numeric-ish
-    try:
-        cl = float(row.get("Career Level"))
-        return cl
-    except Exception:
-        return None
+def _profile_grades(df: pd.DataFrame) -> np.ndarray:
+    """
+    Numeric grade per profile: Global Grade, or Career Level when the grade is
+    missing/zero and the level is numeric-ish. NaN when neither is usable.
+    """
+    if GRADE_NUM in df.columns:
+        gg = df[GRADE_NUM].astype("Float64").to_numpy(dtype=float, na_value=np.nan)
+    else:
+        gg = pd.to_numeric(df["Global Grade"], errors="coerce").to_numpy(dtype=float)
+
+    fallback = (np.isnan(gg) | (gg == 0))
+    if fallback.any() and "Career Level" in df.columns:
+        cl = pd.to_numeric(df["Career Level"], errors="coerce").to_numpy(dtype=float)
+        gg = np.where(fallback, cl, gg)
+    elif fallback.any():
+        gg = np.where(fallback, np.nan, gg)
+    return gg
+
+
+def _grade_similarity(user_grade: float, profile_grades: np.ndarray) -> np.ndarray:
+    """Similarity 0-1 based on grade proximity (0.5 = neutral if missing)."""
+    gap = np.abs(profile_grades - user_grade)
+    denom = np.maximum(np.maximum(profile_grades, user_grade), 1.0)
+    sim = np.maximum(0.0, 1.0 - gap / denom)
+    return np.where(np.isnan(profile_grades), 0.5, sim)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, without sorting the whole
+    array: np.partition finds the k-th largest value in O(n) and only the
+    k survivors are ordered. Ties keep file order (lower index first).
+    """
+    n = len(scores)
+    if k >= n:
+        chosen = np.arange(n)
+    else:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - len(above)]
+        chosen = np.concatenate([above, ties])
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
+class MatchIndex:
+    """
+    Everything compute_job_match needs from the profiles, parsed once:
+    numeric grades plus KPI / competency token sets as uint64 bitsets over a
+    shared vocabulary. A match then is a row lookup plus popcounts.
 
+    Rows are aligned with the DataFrame the index was built from.
+    `partitions` maps (Job Family, Sub Job Family) to the row positions of
+    that sub-family, so the hard filter is a dict lookup.
+    """
 
-def _normalized_grade_similarity(user_grade: float, profile_grade: Optional[float]) -> float:
-    """Similarity 0-1 based on grade proximity."""
-    if profile_grade is None or user_grade is None:
-        return 0.5  # neutral if missing
-    gap = abs(profile_grade - user_grade)
-    denom = max(profile_grade, user_grade, 1.0)
-    return max(0.0, 1.0 - gap / denom)
+    def __init__(self, df_profiles: pd.DataFrame):
+        self.n = len(df_profiles)
+        self.grades = _profile_grades(df_profiles)
+
+        groups = df_profiles.groupby(["Job Family", "Sub Job Family"], observed=True, sort=False)
+        self.partitions: Dict[tuple, np.ndarray] = {
+            key: np.asarray(pos, dtype=np.intp) for key, pos in groups.indices.items()
+        }
+        self.sub_families: Dict[str, List[str]] = {}
+        for jf, sf in self.partitions:
+            self.sub_families.setdefault(jf, []).append(sf)
+        for subs in self.sub_families.values():
+            subs.sort()
+
+        self.kpi_bits, self.kpi_vocab = _token_bitsets(df_profiles["Specific parameters / KPIs"])
+        self.comp_bits, self.comp_vocab = _token_bitsets(
+            df_profiles["Competencies 1"],
+            df_profiles["Competencies 2"],
+            df_profiles["Competencies 3"],
+        )
+        self.kpi_sizes = _popcount(self.kpi_bits)
+        self.comp_sizes = _popcount(self.comp_bits)
+
+        # perfis com grade ordenados por grade (para o top_k com poda) + os sem grade
+        self.graded, self.sorted_grades, self.ungraded = self._grade_order(np.arange(self.n))
+
+    def _grade_order(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        grades = self.grades[positions]
+        valid = ~np.isnan(grades)
+        order = np.argsort(grades[valid], kind="stable")
+        return positions[valid][order], grades[valid][order], positions[~valid]
+
+    def overlap_cap(self, kpis_selected: List[str], competencies_selected: List[str]) -> float:
+        """Upper bound of the KPI + competency share of score() for this selection."""
+        return (
+            0.3 * _jaccard_cap(kpis_selected, self.kpi_vocab)
+            + 0.2 * _jaccard_cap(competencies_selected, self.comp_vocab)
+        )
+
+    def candidates(self, job_family: str, sub_job_family: str) -> np.ndarray:
+        """Row positions of one (Job Family, Sub Job Family); empty if unknown."""
+        return self.partitions.get((job_family, sub_job_family), np.empty(0, dtype=np.intp))
+
+    def score(
+        self,
+        user_grade_hint: float,
+        kpis_selected: List[str],
+        competencies_selected: List[str],
+        positions: np.ndarray | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Component vectors ("grade", "kpi", "comp") and the weighted "score"
+        for the profiles at `positions` (all profiles if None).
+        """
+        sel = slice(None) if positions is None else positions
+
+        grade_sim = _grade_similarity(user_grade_hint, self.grades[sel])
+        kpi_score = _jaccard_bits(self.kpi_bits[sel], self.kpi_sizes[sel], kpis_selected, self.kpi_vocab)
+        comp_score = _jaccard_bits(self.comp_bits[sel], self.comp_sizes[sel], competencies_selected, self.comp_vocab)
+
+        # Combinação ponderada: alinhamento de nível + aderência a KPIs/competências
+        score = 0.5 * grade_sim + 0.3 * kpi_score + 0.2 * comp_score
+
+        return {"grade": grade_sim, "kpi": kpi_score, "comp": comp_score, "score": score}
+
+    def top_k(
+        self,
+        user_grade_hint: float,
+        kpis_selected: List[str],
+        competencies_selected: List[str],
+        k: int,
+        positions: np.ndarray | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Branch-and-bound top-k over `positions` (all profiles if None), same
+        result and tie order as ranking score() exhaustively.
+
+        Grade similarity only falls as a grade moves away from the hint, so
+        the profiles are visited outward from the hint on the sorted grade
+        array, in blocks, always on the side with the closest remaining
+        grade (profiles without grade score a fixed 0.5). KPI and competency
+        overlaps cap at 1 (lower when some selected tokens appear in no
+        profile, see _jaccard_cap), so nothing left can score above
+        0.5 * next_grade_sim + 0.3 * kpi_cap + 0.2 * comp_cap. The search
+        stops once that bound is below the current k-th score.
+
+        Returns "position", "grade", "kpi", "comp", "score" (best first) and
+        "visited", the number of profiles actually scored.
+        """
+        if positions is None:
+            graded, sorted_grades, ungraded = self.graded, self.sorted_grades, self.ungraded
+        else:
+            graded, sorted_grades, ungraded = self._grade_order(np.asarray(positions, dtype=np.intp))
+
+        n_graded = len(graded)
+        k = min(max(1, k), n_graded + len(ungraded))
+        lo = hi = int(np.searchsorted(sorted_grades, user_grade_hint))  # esquerda: [0, lo); direita: [hi, n)
+        ungraded_left = len(ungraded) > 0
+        block = max(2 * k, 32)
+        overlap_cap = self.overlap_cap(kpis_selected, competencies_selected)
+
+        def next_sim(i: int) -> float:
+            if 0 <= i < n_graded:
+                return float(_grade_similarity(user_grade_hint, sorted_grades[i:i + 1])[0])
+            return -np.inf
+
+        keys = ("grade", "kpi", "comp", "score")
+        best = {"position": np.empty(0, dtype=np.intp), **{key: np.empty(0) for key in keys}}
+        visited = 0
+
+        while True:
+            left, right = next_sim(lo - 1), next_sim(hi)
+            nan_sim = 0.5 if ungraded_left else -np.inf
+            frontier = max(left, right, nan_sim)
+            if frontier == -np.inf:
+                break  # todos visitados
+            if len(best["position"]) == k and 0.5 * frontier + overlap_cap < best["score"][-1]:
+                break  # nenhum restante alcança o k-ésimo
+
+            if ungraded_left and nan_sim >= max(left, right):
+                batch = ungraded
+                ungraded_left = False
+            elif left >= right:
+                batch = graded[max(0, lo - block):lo]
+                lo = max(0, lo - block)
+            else:
+                batch = graded[hi:hi + block]
+                hi = min(n_graded, hi + block)
+            block *= 2
+            visited += len(batch)
+
+            sc = self.score(user_grade_hint, kpis_selected, competencies_selected, batch)
+            merged = {"position": np.concatenate([best["position"], batch])}
+            for key in keys:
+                merged[key] = np.concatenate([best[key], sc[key]])
+            keep = np.lexsort((merged["position"], -merged["score"]))[:k]
+            best = {key: value[keep] for key, value in merged.items()}
+
+        best["visited"] = visited
+        return best
+
+    def score_batch(
+        self,
+        user_grade_hints: np.ndarray,
+        kpis_selected: List[List[str]],
+        competencies_selected: List[List[str]],
+        positions: np.ndarray | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        score() for several users against the same candidates: every vector
+        becomes a (n_users, n_candidates) matrix, row i matching user i.
+        """
+        sel = slice(None) if positions is None else positions
+
+        hints = np.asarray(user_grade_hints, dtype=float)[:, None]
+        grades = self.grades[sel][None, :]
+        gap = np.abs(grades - hints)
+        denom = np.maximum(np.maximum(grades, hints), 1.0)
+        grade_sim = np.where(np.isnan(grades), 0.5, np.maximum(0.0, 1.0 - gap / denom))
+
+        kpi_score = _jaccard_bits_many(self.kpi_bits[sel], self.kpi_sizes[sel], kpis_selected, self.kpi_vocab)
+        comp_score = _jaccard_bits_many(
+            self.comp_bits[sel], self.comp_sizes[sel], competencies_selected, self.comp_vocab
+        )
+
+        score = 0.5 * grade_sim + 0.3 * kpi_score + 0.2 * comp_score
+
+        return {"grade": grade_sim, "kpi": kpi_score, "comp": comp_score, "score": score}
 
 
 # ==========================================================
 # PUBLIC: MAIN MATCH FUNCTION
 # ==========================================================
-def compute_job_match(form_inputs: Dict[str, Any], df_profiles: pd.DataFrame) -> Dict[str, Any] | None:
+# Quando o compute_job_match troca o score exaustivo pelo MatchIndex.top_k.
+# A poda só corta cedo se o teto de KPIs + competências (overlap_cap) for
+# baixo: com os dois preenchidos (teto 0.5) visita ~100% até 20k perfis e
+# perde do exaustivo em qualquer tamanho. Com candidatos vindos de
+# `positions`, top_k ainda ordena os grades a cada chamada, o que só se paga
+# a partir de ~20k candidatos (medido com benchmarks.bench_match, linhas
+# prune_<seleção>).
+_PRUNE_MIN_CANDIDATES = 20_000
+_PRUNE_MAX_OVERLAP_CAP = 0.2
+
+
+def _prune_pays(n_candidates: int, overlap_cap: float) -> bool:
+    """True se MatchIndex.top_k tende a ser mais rápido que o score exaustivo."""
+    return n_candidates >= _PRUNE_MIN_CANDIDATES and overlap_cap <= _PRUNE_MAX_OVERLAP_CAP
+
+
+@timed("match.total")
+def compute_job_match(
+    form_inputs: Dict[str, Any],
+    df_profiles: pd.DataFrame,
+    index: MatchIndex | None = None,
+    top_k: int = 1,
+) -> Dict[str, Any] | None:
     """
     form_inputs: dicionário vindo da UI (5_Job_Match.py) com:
       - job_family, sub_job_family
@@ -161,8 +555,15 @@ def compute_job_match(form_inputs: Dict[str, Any], df_profiles: pd.DataFrame) ->
                  "Grade Differentiator", "Qualifications",
                  "Specific parameters / KPIs", "Competencies 1", "Competencies 2", "Competencies 3"
 
+    index: MatchIndex construído sobre o mesmo df_profiles (opcional). Sem ele,
+           o índice é montado só para os candidatos filtrados.
+
+    top_k: quantos perfis devolver em "matches" (o melhor incluído).
+
     Retorna:
-        {"row": best_row (Series), "score_pct": int} ou None.
+        {"row": best_row (Series), "score_pct": int, "matches": [...]} ou None.
+        Cada item de "matches" traz "position" (linha em df_profiles), "score",
+        "grade", "kpi", "comp" e "score_pct", do melhor para o pior.
     """
 
     required_cols = {
@@ -177,83 +578,405 @@ def compute_job_match(form_inputs: Dict[str, Any], df_profiles: pd.DataFrame) ->
     missing = required_cols - set(df_profiles.columns)
     if missing:
         raise ValueError(f"Missing columns in Job Profile dataset: {', '.join(sorted(missing))}")
-
-    emap = _encode_map()
+    if index is not None and index.n != len(df_profiles):
+        raise ValueError("MatchIndex was built for a different Job Profile dataset")
 
     job_family = form_inputs["job_family"]
     sub_job_family = form_inputs["sub_job_family"]
 
     # 1) HARD FILTER: mesma Job Family + Sub Job Family
-    df_filtered = df_profiles[
-        (df_profiles["Job Family"] == job_family) &
-        (df_profiles["Sub Job Family"] == sub_job_family)
-    ].copy()
-
-    if df_filtered.empty:
+    with span("match.filter"):
+        if index is None:
+            positions = np.flatnonzero(
+                ((df_profiles["Job Family"] == job_family) &
+                 (df_profiles["Sub Job Family"] == sub_job_family)).to_numpy()
+            )
+        else:
+            positions = index.candidates(job_family, sub_job_family)
+
+    if len(positions) == 0:
         return None
 
-    # 2) User signature (numérico) — mesmo que a versão unificada
-    user_sig = {
-        "cat": _enc(form_inputs["job_category"], emap),
-        "geo": _enc(form_inputs["geo_scope"], emap),
-        "impact": _enc(form_inputs["org_impact"], emap),
-        "span": _enc(form_inputs["span_control"], emap),
-        "nature": _enc(form_inputs["nature_work"], emap),
-        "finimp": _enc(form_inputs["financial_impact"], emap),
-        "stake": _enc(form_inputs["stakeholder_complexity"], emap),
-        "dtype": _enc(form_inputs["decision_type"], emap),
-        "dhoriz": _enc(form_inputs["decision_horizon"], emap),
-
-        "auto": _enc(form_inputs["autonomy"], emap),
-        "ps": _enc(form_inputs["problem_solving"], emap),
-        "kdepth": _enc(form_inputs["knowledge_depth"], emap),
-        "opcomp": _enc(form_inputs["operational_complexity"], emap),
-        "infl": _enc(form_inputs["influence_level"], emap),
-
-        "edu": _enc(form_inputs["education"], emap),
-        "exp": _enc(form_inputs["experience"], emap),
-        "spec": _enc(form_inputs["specialization_level"], emap),
-        "innov": _enc(form_inputs["innovation_resp"], emap),
-        "lead": _enc(form_inputs["leadership_type"], emap),
-        "orginf": _enc(form_inputs["org_influence"], emap),
-    }
+    # 2) User signature (numérico, um código por campo do formulário)
+    with span("match.encode"):
+        user_sig = encode_form(form_inputs)
+
+        kpis_selected = form_inputs["kpis_selected"]
+        competencies_selected = form_inputs["competencies_selected"]
+
+        # Estimar um "nível" do usuário a partir de sinais de senioridade
+        user_grade_hint = float(grade_hints(user_sig))
+
+    # 3) Muitos candidatos e teto de KPIs/competências baixo: top-K com poda
+    #    pelo limite superior do score
+    if index is not None and _prune_pays(
+        len(positions), index.overlap_cap(kpis_selected, competencies_selected)
+    ):
+        with span("match.prune"):
+            found = index.top_k(user_grade_hint, kpis_selected, competencies_selected, top_k, positions)
+        with span("match.result"):
+            return _match_result(df_profiles, found["position"], found, np.arange(len(found["position"])))
+
+    # Scores de todos os candidatos de uma vez (grade, KPIs, competências)
+    if index is None:
+        with span("match.index_build"):
+            index = MatchIndex(df_profiles.iloc[positions])
+        positions_in_index = None
+    else:
+        positions_in_index = positions
+    with span("match.score"):
+        scores = index.score(user_grade_hint, kpis_selected, competencies_selected, positions_in_index)
+
+    # 4) Top-K por seleção parcial (sem ordenar todos os candidatos)
+    with span("match.top_k"):
+        order = _top_k(scores["score"], max(1, top_k))
+    with span("match.result"):
+        return _match_result(df_profiles, positions, scores, order)
+
+
+def _match_result(
+    df_profiles: pd.DataFrame,
+    positions: np.ndarray,
+    scores: Dict[str, np.ndarray],
+    order: np.ndarray,
+) -> Dict[str, Any]:
+    """{"row", "score_pct", "matches"} for the candidates `order` (best first)."""
+    matches = _match_items(positions, scores, order)
+
+    # só a linha vencedora é copiada; as alternativas ficam como posições
+    best = df_profiles.iloc[matches[0]["position"]].copy()
+    best["__match_score"] = scores["score"][order[0]]
+
+    return {"row": best, "score_pct": matches[0]["score_pct"], "matches": matches}
+
+
+def _match_items(
+    positions: np.ndarray,
+    scores: Dict[str, np.ndarray],
+    order: np.ndarray,
+) -> List[Dict[str, Any]]:
+    """The "matches" list of _match_result: score_pct is relative to the first of `order`."""
+    final = scores["score"]
+    max_score = float(final[order[0]])
+
+    return [
+        {
+            "position": int(positions[i]),
+            "score": float(final[i]),
+            "grade": float(scores["grade"][i]),
+            "kpi": float(scores["kpi"][i]),
+            "comp": float(scores["comp"][i]),
+            "score_pct": int(round((float(final[i]) / max_score) * 100)) if max_score > 0 else 60,
+        }
+        for i in order
+    ]
 
-    kpis_selected = form_inputs["kpis_selected"]
-    competencies_selected = form_inputs["competencies_selected"]
 
-    # 3) KPIs / Competências da base
-    df_filtered["__kpis_list"] = df_filtered["Specific parameters / KPIs"].apply(_clean_list)
+# ==========================================================
+# PUBLIC: PRÉVIA AO VIVO (re-score incremental)
+# ==========================================================
+class LiveMatch:
+    """
+    Component vectors of one (Job Family, Sub Job Family) candidate set, kept
+    between reruns for the live preview.
+
+    Each component depends on part of the form only: "grade" on the grade
+    hint (seniority fields), "kpi" on kpis_selected and "comp" on
+    competencies_selected. rank() recomputes just the components whose input
+    changed since the last call and recombines them; a change to any other
+    field costs only the weighted sum and the top-k. The ranking is the same
+    as compute_job_match with the same index.
+    """
 
-    df_filtered["__comp_list"] = (
-        df_filtered["Competencies 1"].fillna("") + "," +
-        df_filtered["Competencies 2"].fillna("") + "," +
-        df_filtered["Competencies 3"].fillna("")
-    ).apply(_clean_list)
+    COMPONENTS = ("grade", "kpi", "comp")
+
+    def __init__(self, index: MatchIndex, job_family: str, sub_job_family: str):
+        self.index = index
+        self.family = (job_family, sub_job_family)
+        self.positions = index.candidates(job_family, sub_job_family)
+        self.inputs: Dict[str, Any] = dict.fromkeys(self.COMPONENTS)
+        self.vectors: Dict[str, np.ndarray] = {}
+        # quantas vezes cada componente foi recalculado (diagnóstico da prévia)
+        self.recomputed = dict.fromkeys(self.COMPONENTS, 0)
+
+    def _component_inputs(self, form_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "grade": float(grade_hints(encode_form(form_inputs))),
+            "kpi": tuple(sorted(set(form_inputs.get("kpis_selected") or []))),
+            "comp": tuple(sorted(set(form_inputs.get("competencies_selected") or []))),
+        }
+
+    def _compute(self, component: str, value: Any) -> np.ndarray:
+        idx, sel = self.index, self.positions
+        if component == "grade":
+            return _grade_similarity(value, idx.grades[sel])
+        if component == "kpi":
+            return _jaccard_bits(idx.kpi_bits[sel], idx.kpi_sizes[sel], list(value), idx.kpi_vocab)
+        return _jaccard_bits(idx.comp_bits[sel], idx.comp_sizes[sel], list(value), idx.comp_vocab)
+
+    def rank(self, form_inputs: Dict[str, Any], top_k: int = 1) -> List[Dict[str, Any]]:
+        """
+        Top-k of the candidate set for `form_inputs`, in the "matches" format
+        of compute_job_match (empty list when the set is empty).
+        """
+        if len(self.positions) == 0:
+            return []
+
+        for component, value in self._component_inputs(form_inputs).items():
+            if component not in self.vectors or self.inputs[component] != value:
+                self.vectors[component] = self._compute(component, value)
+                self.inputs[component] = value
+                self.recomputed[component] += 1
+
+        scores = dict(self.vectors)
+        scores["score"] = 0.5 * scores["grade"] + 0.3 * scores["kpi"] + 0.2 * scores["comp"]
+        return _match_items(self.positions, scores, _top_k(scores["score"], max(1, top_k)))
 
-    # 4) Global Grade numérico para penalidade
-    df_filtered["__gg_num"] = pd.to_numeric(df_filtered["Global Grade"], errors="coerce")
 
-    # Estimar um "nível" do usuário a partir de sinais de senioridade
-    user_grade_hint = (
-        user_sig["lead"] + user_sig["orginf"] + user_sig["impact"] + user_sig["span"] + user_sig["geo"]
-    ) / 5.0
+# ==========================================================
+# PUBLIC: BUSCA EM TODAS AS FAMÍLIAS (BallTree)
+# ==========================================================
+# letra da Career Level ("P3" → "P") → código equivalente de job_category
+CAREER_BAND_LEVELS = {"EX": 5, "M": 4, "P": 3, "S": 3, "T": 2, "U": 2, "W": 1}
 
-    scores: List[float] = []
-    for _, row in df_filtered.iterrows():
-        profile_grade = _grade_from_row(row)
-        grade_sim = _normalized_grade_similarity(user_grade_hint, profile_grade)
+# peso de cada bloco do vetor de busca (mesma divisão 0.5 / 0.3 / 0.2 do match)
+SEARCH_WEIGHTS = {"band": 0.25, "seniority": 0.25, "kpi": 0.3, "comp": 0.2}
 
-        kpi_score = _overlap(kpis_selected, row["__kpis_list"])
-        comp_score = _overlap(competencies_selected, row["__comp_list"])
+# maior distância² possível: banda/senioridade em [0, 1]; blocos de tokens com norma <= 1 e >= 0
+_SEARCH_D2_MAX = SEARCH_WEIGHTS["band"] + SEARCH_WEIGHTS["seniority"] + 2 * (SEARCH_WEIGHTS["kpi"] + SEARCH_WEIGHTS["comp"])
+
+_CODE_MIN = np.array([min(FORM_ENCODERS[f].values()) for f in SIGNATURE_FIELDS], dtype=float)
+_CODE_MAX = np.array([max(FORM_ENCODERS[f].values()) for f in SIGNATURE_FIELDS], dtype=float)
+_JOB_CATEGORY_COL = SIGNATURE_FIELDS.index("job_category")
+
+
+def _unit_rows(bits: np.ndarray, n_tokens: int) -> np.ndarray:
+    """
+    uint64 bitsets → multi-hot rows of unit length. A last "empty" column is
+    set for profiles without tokens, so an empty list is never closer to a
+    query than a non-matching one.
+    """
+    as_bytes = np.ascontiguousarray(bits.astype("<u8")).view(np.uint8)
+    dense = np.unpackbits(as_bytes, axis=1, bitorder="little")[:, :n_tokens].astype(float)
+    dense = np.hstack([dense, (dense.sum(axis=1) == 0).astype(float)[:, None]])
+    return dense / np.linalg.norm(dense, axis=1, keepdims=True)
 
-        # Combinação ponderada: alinhamento de nível + aderência a KPIs/competências
-        final_score = 0.5 * grade_sim + 0.3 * kpi_score + 0.2 * comp_score
-        scores.append(final_score)
 
-    df_filtered["__match_score"] = scores
-    best = df_filtered.sort_values("__match_score", ascending=False).iloc[0]
+def _selection_vector(selected: Any, vocab: Dict[str, int]) -> np.ndarray:
+    """
+    Query side of _unit_rows: (1, len(vocab) + 1), scaled by the size of the
+    whole selection, so tokens no profile uses still weigh (like the Jaccard
+    union). Zero when nothing was selected.
+    """
+    tokens = set(_as_selection(selected))
+    vec = np.zeros((1, len(vocab) + 1))
+    for tok in tokens:
+        if tok in vocab:
+            vec[0, vocab[tok]] = 1.0
+    return vec / np.sqrt(len(tokens)) if tokens else vec
 
-    max_score = float(df_filtered["__match_score"].max())
-    score_pct = int(round((float(best["__match_score"]) / max_score) * 100)) if max_score > 0 else 60
 
-    return {"row": best, "score_pct": score_pct}
+class SignatureIndex:
+    """
+    Every profile as a point in the space of the full form signature, indexed
+    with a scikit-learn BallTree, for "which profiles anywhere look like this
+    role" without the Job Family / Sub Job Family filter.
+
+    The profiles carry no answers for the 20 form fields, so both sides are
+    projected onto what they share:
+      - band: job_category vs the Career Level letter (CAREER_BAND_LEVELS);
+      - seniority: mean of all chosen signature codes (each scaled to 0-1)
+        vs the profile grade scaled to 0-1 over the dataset;
+      - KPIs / competencies: multi-hot vectors of unit length (MatchIndex
+        vocab), compared by cosine.
+    Blocks are scaled by sqrt(SEARCH_WEIGHTS), so the squared euclidean
+    distance is the weighted sum of the per-block squared distances.
+    """
+
+    def __init__(self, df_profiles: pd.DataFrame, index: MatchIndex | None = None):
+        from sklearn.neighbors import BallTree
+
+        self.index = index if index is not None else MatchIndex(df_profiles)
+        if self.index.n != len(df_profiles):
+            raise ValueError("MatchIndex was built for a different Job Profile dataset")
+
+        grades = self.index.grades
+        g_min, g_max = np.nanmin(grades), np.nanmax(grades)
+        seniority = (grades - g_min) / max(g_max - g_min, 1.0)
+
+        letters = df_profiles["Career Level"].astype("string").str.extract(r"^([A-Za-z]+)", expand=False)
+        band = letters.str.upper().map(CAREER_BAND_LEVELS).astype(float).to_numpy(na_value=np.nan)
+
+        self.kpi_unit = _unit_rows(self.index.kpi_bits, len(self.index.kpi_vocab))
+        self.comp_unit = _unit_rows(self.index.comp_bits, len(self.index.comp_vocab))
+
+        self.features = self._features(
+            np.nan_to_num((band - 1) / 4, nan=0.5),
+            np.nan_to_num(seniority, nan=0.5),
+            self.kpi_unit,
+            self.comp_unit,
+        )
+        n_kpi = self.kpi_unit.shape[1]
+        self._blocks = {
+            "band": slice(0, 1),
+            "seniority": slice(1, 2),
+            "kpi": slice(2, 2 + n_kpi),
+            "comp": slice(2 + n_kpi, None),
+        }
+        self.tree = BallTree(self.features)
+
+    @staticmethod
+    def _features(band, seniority, kpi_unit, comp_unit) -> np.ndarray:
+        w = {k: np.sqrt(v) for k, v in SEARCH_WEIGHTS.items()}
+        return np.hstack([
+            w["band"] * np.asarray(band, dtype=float).reshape(-1, 1),
+            w["seniority"] * np.asarray(seniority, dtype=float).reshape(-1, 1),
+            w["kpi"] * kpi_unit,
+            w["comp"] * comp_unit,
+        ])
+
+    def query_vector(self, form_inputs: Dict[str, Any]) -> np.ndarray:
+        """The form as a (1, n_features) point; fields left on "Choose option" are ignored."""
+        sig = encode_form(form_inputs).astype(float)
+        chosen = sig > 0
+        scaled = (sig - _CODE_MIN) / (_CODE_MAX - _CODE_MIN)
+        seniority = scaled[chosen].mean() if chosen.any() else 0.5
+        band = (sig[_JOB_CATEGORY_COL] - 1) / 4 if chosen[_JOB_CATEGORY_COL] else 0.5
+
+        kpi = _selection_vector(form_inputs.get("kpis_selected"), self.index.kpi_vocab)
+        comp = _selection_vector(form_inputs.get("competencies_selected"), self.index.comp_vocab)
+
+        return self._features(band, seniority, kpi, comp)
+
+    def search(self, form_inputs: Dict[str, Any], k: int = 5) -> Dict[str, np.ndarray]:
+        """
+        The k nearest profiles: "position" plus "score" (1 - d²/d²max, 0-1)
+        and the per-block similarities "grade" (band + seniority), "kpi"
+        and "comp" (cosine), best first.
+        """
+        query = self.query_vector(form_inputs)[0]
+        dist, pos = self.tree.query(query[None, :], k=min(max(1, k), self.index.n))
+        pos = pos[0]
+        rows = self.features[pos]
+
+        # distância² por bloco, sem o peso (cada uma em 0-1 ou 0-2)
+        d2 = {
+            block: ((rows[:, cols] - query[cols]) ** 2).sum(axis=1) / SEARCH_WEIGHTS[block]
+            for block, cols in self._blocks.items()
+        }
+        out = {
+            "position": pos,
+            "score": 1.0 - dist[0] ** 2 / _SEARCH_D2_MAX,
+            "grade": 1.0 - (d2["band"] + d2["seniority"]) / 2,
+            "kpi": rows[:, self._blocks["kpi"]] @ query[self._blocks["kpi"]] / SEARCH_WEIGHTS["kpi"],
+            "comp": rows[:, self._blocks["comp"]] @ query[self._blocks["comp"]] / SEARCH_WEIGHTS["comp"],
+        }
+        # mesma ordem de desempate do match: score desc, depois ordem do arquivo
+        order = np.lexsort((pos, -out["score"]))
+        return {key: value[order] for key, value in out.items()}
+
+
+def search_all_families(
+    form_inputs: Dict[str, Any],
+    df_profiles: pd.DataFrame,
+    index: SignatureIndex,
+    top_k: int = 5,
+) -> Dict[str, Any] | None:
+    """
+    Como compute_job_match (mesmo formato de retorno), mas sem o filtro de
+    Job Family / Sub Job Family: os top_k perfis mais próximos da assinatura
+    completa do formulário em toda a arquitetura (SignatureIndex).
+    """
+    if index.index.n != len(df_profiles):
+        raise ValueError("SignatureIndex was built for a different Job Profile dataset")
+    if len(df_profiles) == 0:
+        return None
+
+    found = index.search(form_inputs, top_k)
+    return _match_result(df_profiles, found["position"], found, np.arange(len(found["position"])))
+
+
+# ==========================================================
+# PUBLIC: MATCH EM LOTE
+# ==========================================================
+# colunas do resultado de compute_job_matches (formato longo, uma linha por rank)
+BATCH_RESULT_COLUMNS = ["row", "rank", "position", "score", "grade", "kpi", "comp", "score_pct"]
+
+# teto de células (usuários x candidatos) por bloco de score_batch
+_BATCH_CELLS = 1 << 20
+# até este nº de candidatos o top-K do lote é um argsort da matriz toda
+_BATCH_SORT_MAX = 256
+
+
+def compute_job_matches(
+    forms: pd.DataFrame | List[Dict[str, Any]],
+    index: MatchIndex,
+    top_k: int = 1,
+) -> pd.DataFrame:
+    """
+    compute_job_match para muitos formulários de uma vez, contra um MatchIndex
+    já construído. Os formulários são codificados em bloco (encode_forms) e
+    agrupados por (Job Family, Sub Job Family): cada grupo é pontuado como uma
+    matriz usuários x candidatos.
+
+    forms: mesmos campos de form_values; kpis_selected/competencies_selected
+           podem ser listas ou texto separado por vírgulas.
+
+    Retorna um DataFrame com BATCH_RESULT_COLUMNS: "row" é a posição do
+    formulário em `forms`, "position" a linha do perfil no índice e "rank"
+    começa em 1. Formulários sem candidatos não aparecem. Mesmo desempate
+    de compute_job_match (ordem do arquivo).
+    """
+    frame = forms if isinstance(forms, pd.DataFrame) else pd.DataFrame.from_records(forms)
+    n = len(frame)
+    if n == 0:
+        return pd.DataFrame(columns=BATCH_RESULT_COLUMNS)
+
+    hints = grade_hints(encode_forms(frame)).astype(float)
+    empty = pd.Series([None] * n, index=frame.index)
+    kpis = [_as_selection(v) for v in frame.get("kpis_selected", empty)]
+    comps = [_as_selection(v) for v in frame.get("competencies_selected", empty)]
+
+    keys = pd.DataFrame({
+        "jf": frame.get("job_family", empty).astype("string").str.strip().to_numpy(),
+        "sf": frame.get("sub_job_family", empty).astype("string").str.strip().to_numpy(),
+    })
+    k = max(1, top_k)
+    cols: Dict[str, List[np.ndarray]] = {c: [] for c in BATCH_RESULT_COLUMNS}
+
+    for (jf, sf), rows in keys.groupby(["jf", "sf"], sort=False).indices.items():
+        cand = index.candidates(jf, sf)
+        if len(cand) == 0:
+            continue
+
+        step = max(1, _BATCH_CELLS // len(cand))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            sc = index.score_batch(hints[block], [kpis[i] for i in block], [comps[i] for i in block], cand)
+            final = sc["score"]
+
+            if k == 1:
+                order = np.argmax(final, axis=1)[:, None]  # 1º máximo = ordem do arquivo
+            elif len(cand) <= _BATCH_SORT_MAX:
+                # sub-famílias pequenas: ordenação estável da matriz inteira (empate → ordem do arquivo)
+                order = np.argsort(-final, axis=1, kind="stable")[:, :k]
+            else:
+                order = np.array([_top_k(r, k) for r in final])
+
+            best = final.max(axis=1, keepdims=True)
+            top = np.take_along_axis(final, order, axis=1)
+            pct = np.where(best > 0, np.round(top / np.where(best > 0, best, 1.0) * 100), 60)
+
+            width = order.shape[1]
+            cols["row"].append(np.repeat(block, width))
+            cols["rank"].append(np.tile(np.arange(1, width + 1), len(block)))
+            cols["position"].append(cand[order].ravel())
+            cols["score"].append(top.ravel())
+            for comp in ("grade", "kpi", "comp"):
+                cols[comp].append(np.take_along_axis(sc[comp], order, axis=1).ravel())
+            cols["score_pct"].append(pct.astype(np.int64).ravel())
+
+    if not cols["row"]:
+        return pd.DataFrame(columns=BATCH_RESULT_COLUMNS)
+    out = pd.DataFrame({c: np.concatenate(v) for c, v in cols.items()})
+    return out.sort_values(["row", "rank"], ignore_index=True)
@@ -3,6 +3,8 @@ import base64
 import os
 import pandas as pd
 
+from utils.data_store import get_repository
+
 # ==========================================================
 # CONFIG
 # ==========================================================
@@ -67,17 +69,26 @@ st.markdown("""
 # ==========================================================
 # CARREGAR ARQUIVO
 # ==========================================================
-file_path = "data/Job Family.xlsx"
+repo = get_repository()
 
-if not os.path.exists(file_path):
+if "job_family" not in repo:
     st.error("Arquivo **'Job Family.xlsx'** não encontrado na pasta `data/`.")
     st.stop()
 
-df = pd.read_excel(file_path)
-df.columns = [str(c).strip() for c in df.columns]
 
-# remove a primeira coluna (sequencial)
-df = df.iloc[:, 1:]
+def prepare_job_families(raw: pd.DataFrame) -> pd.DataFrame:
+    df = raw.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+
+    # remove a primeira coluna (sequencial)
+    return df.iloc[:, 1:]
+
+
+df = repo.derived(
+    "job_families.table",
+    lambda: prepare_job_families(repo["job_family"]),
+    depends_on=("job_family",),
+)
 
 required_cols = {"Job Family", "Sub Job Family"}
 if not required_cols.issubset(df.columns):
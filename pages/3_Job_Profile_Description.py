@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
 import html
 import streamlit.components.v1 as components
 import base64
-import os
+
+from html_renderer import ICON_DEFS, ICONS_SVG, RENDER_CACHE, RENDER_COLUMNS
+from utils.data_store import get_repository
 
 # ---------------------------------------------------------
 # PAGE CONFIG
@@ -74,35 +75,13 @@ st.markdown("""
 # ---------------------------------------------------------
 # LOAD DATA
 # ---------------------------------------------------------
-@st.cache_data
-def load_profiles():
-    return pd.read_excel("data/Job Profile.xlsx")
-
-df = load_profiles()
+# versão lida antes do frame (chave do HTML em cache, ver build_html)
+profiles_version = get_repository().version("job_profile")
+df = get_repository().project("job_profile", RENDER_COLUMNS)
 
-# ---------------------------------------------------------
-# INLINE SVG LOADER
-# ---------------------------------------------------------
-def load_svg(svg_name):
-    path = f"assets/icons/sig/{svg_name}"
-    if not os.path.exists(path):
-        return ""
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
-
-# Icones SVG
-icons_svg = {
-    "Sub Job Family Description": load_svg("Hierarchy.svg"),
-    "Job Profile Description": load_svg("Content_Book_Phone.svg"),
-    "Career Band Description": load_svg("File_Clipboard_Text.svg"),
-    "Role Description": load_svg("Shopping_Business_Target.svg"),
-    "Grade Differentiator": load_svg("User_Add.svg"),
-    "Qualifications": load_svg("Edit_Pencil.svg"),
-    "Specific parameters / KPIs": load_svg("Graph_Bar.svg"),
-    "Competencies 1": load_svg("Setting_Cog.svg"),
-    "Competencies 2": load_svg("Setting_Cog.svg"),
-    "Competencies 3": load_svg("Setting_Cog.svg"),
-}
+# Icones SVG: <use> do sprite do html_renderer; os <symbol> vão uma vez
+# no documento (ICON_DEFS), não um SVG inteiro por seção x perfil
+icons_svg = ICONS_SVG
 
 # ---------------------------------------------------------
 # TOP FILTERS
@@ -170,6 +149,13 @@ sections = [
 # BUILD HTML
 # ---------------------------------------------------------
 def build_html(profiles):
+    # mesmos perfis, na mesma ordem, da mesma versão do Job Profile → HTML do
+    # cache compartilhado do renderer (evita remontar os cards a cada rerun)
+    key = ("comparison", tuple(p["Full Job Code"] for p in profiles), profiles_version)
+    return RENDER_CACHE.get_or_compute(key, lambda: _build_html(profiles))
+
+
+def _build_html(profiles):
 
     n = len(profiles)
 
@@ -287,6 +273,7 @@ html, body {{
 </head>
 
 <body>
+{ICON_DEFS}
 
 <div id="viewport">
 
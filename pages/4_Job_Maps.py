@@ -4,9 +4,12 @@
 # + botões abaixo da coluna GG sem mexer no mapa
 
 import streamlit as st
-import pandas as pd
 import streamlit.components.v1 as components
-from utils.data_loader import load_excel_data
+from utils.data_loader import GRADE_NUM, GRADE_STR
+from utils.data_store import get_repository
+
+# colunas do Job Profile usadas pelo mapa (generate_map + filtros)
+MAP_COLUMNS = ["Job Family", "Sub Job Family", "Career Path", "Global Grade", "Job Profile"]
 
 # ==========================================================
 # CONFIG
@@ -195,16 +198,21 @@ st.markdown(css, unsafe_allow_html=True)
 # ==========================================================
 # CARREGAR DADOS
 # ==========================================================
-data = load_excel_data()
-df = data.get("job_profile", pd.DataFrame())
-
-df = df.copy()
-df["Job Family"] = df["Job Family"].astype(str).str.strip()
-df["Sub Job Family"] = df["Sub Job Family"].astype(str).str.strip().replace(
-    ['nan','None','<NA>',''], '-'
+# o repositório já entrega o Job Profile normalizado (categorias + GRADE_NUM/GRADE_STR);
+# aqui só a subfamília vazia vira "-", uma vez por processo
+def prepare_map_frame(df):
+    if df["Sub Job Family"].isna().any():
+        df = df.copy()
+        df["Sub Job Family"] = df["Sub Job Family"].cat.add_categories("-").fillna("-")
+    return df
+
+
+data = get_repository()
+df = data.derived(
+    "job_maps.frame",
+    lambda: prepare_map_frame(data.project("job_profile", MAP_COLUMNS)),
+    depends_on=("job_profile",),
 )
-df["Career Path"] = df["Career Path"].astype(str).str.strip()
-df["Global Grade"] = df["Global Grade"].astype(str).str.replace(r"\.0$","",regex=True)
 
 # ==========================================================
 # CORES
@@ -220,10 +228,10 @@ def get_path_color(path):
 # FILTROS
 # ==========================================================
 colA, colB = st.columns(2)
-fam_filter = colA.selectbox("Job Family", ["Todas"] + sorted(df["Job Family"].unique()))
-path_filter = colB.selectbox("Career Path", ["Todas"] + sorted(df["Career Path"].unique()))
+fam_filter = colA.selectbox("Job Family", ["Todas"] + sorted(df["Job Family"].dropna().unique()))
+path_filter = colB.selectbox("Career Path", ["Todas"] + sorted(df["Career Path"].dropna().unique()))
 
-df_flt = df.copy()
+df_flt = df
 if fam_filter != "Todas":
     df_flt = df_flt[df_flt["Job Family"] == fam_filter]
 if path_filter != "Todas":
@@ -232,27 +240,28 @@ if path_filter != "Todas":
 # ==========================================================
 # MAPA
 # ==========================================================
-@st.cache_data(ttl=600)
+@st.cache_data
 def generate_map(df):
 
     fam_max = (
-        df.groupby("Job Family")["Global Grade"]
-        .apply(lambda x: max(int(g) for g in x if str(g).isdigit()))
+        df.groupby("Job Family", observed=True)[GRADE_NUM]
+        .max()
         .sort_values(ascending=False)
     )
     families_order = fam_max.index.tolist()
 
+    sub_max = df.groupby(["Job Family", "Sub Job Family"], observed=True)[GRADE_NUM].max()
     submap_ordered = {}
     for fam in families_order:
-        tmp = (
-            df[df["Job Family"] == fam]
-            .groupby("Sub Job Family")["Global Grade"]
-            .apply(lambda x: max(int(g) for g in x if str(g).isdigit()))
-            .sort_values(ascending=False)
-        )
+        tmp = sub_max.xs(fam, level="Job Family").sort_values(ascending=False)
         submap_ordered[fam] = tmp.index.tolist()
 
-    grades = sorted(df["Global Grade"].unique(), key=lambda x: int(x), reverse=True)
+    grades = (
+        df[[GRADE_NUM, GRADE_STR]]
+        .drop_duplicates()
+        .sort_values(GRADE_NUM, ascending=False)[GRADE_STR]
+        .tolist()
+    )
 
     submap = {}
     col_index = 2
@@ -261,7 +270,7 @@ def generate_map(df):
             submap[(fam, sf)] = col_index
             col_index += 1
 
-    grouped = df.groupby(["Job Family", "Sub Job Family", "Global Grade"])
+    grouped = df.groupby(["Job Family", "Sub Job Family", GRADE_STR], observed=True)
     cards = {k: v.to_dict("records") for k, v in grouped}
 
     html = []
@@ -298,6 +307,9 @@ def generate_map(df):
     html.append("</div></div>")
     return "".join(html)
 
+# novo Job Profile.xlsx em data/ → o watcher do repositório limpa o HTML cacheado
+data.on_change("job_maps.generate_map", ("job_profile",), generate_map.clear)
+
 # ==========================================================
 # FULLSCREEN STATE
 # ==========================================================
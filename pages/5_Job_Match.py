@@ -10,8 +10,24 @@ import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
-from match_engine import compute_job_match
-from html_renderer import render_job_description
+from match_engine import (
+    compute_job_match,
+    canonical_form,
+    search_all_families,
+    LiveMatch,
+    MatchIndex,
+    SignatureIndex,
+    MATCH_COLUMNS,
+    FORM_OPTIONS,
+    KPI_OPTIONS,
+    COMPETENCY_OPTIONS,
+)
+from html_renderer import render_job_description, RENDER_CACHE, RENDER_COLUMNS
+import text_match
+from text_match import TextIndex, match_text
+from utils.data_store import get_repository
+from utils.lru_cache import LRUCache
+from utils import timing
 
 
 # ----------------------------------------------------------
@@ -122,16 +138,61 @@ st.markdown(
 
 
 # ----------------------------------------------------------
-# LOAD JOB PROFILE DATA (colunas ORIGINAIS)
+# LOAD JOB PROFILE DATA (colunas ORIGINAIS, só as usadas pelo motor + renderer)
 # ----------------------------------------------------------
-@st.cache_data
+def fill_text_na(df: pd.DataFrame) -> pd.DataFrame:
+    # só colunas de texto: as categorias e o grade numérico mantêm NA
+    text_cols = [
+        c for c in df.columns
+        if pd.api.types.is_string_dtype(df[c]) and not isinstance(df[c].dtype, pd.CategoricalDtype)
+    ]
+    return df.fillna({c: "" for c in text_cols})
+
+
 def load_job_profiles() -> pd.DataFrame:
-    df = pd.read_excel("data/Job Profile.xlsx").fillna("")
-    return df
+    repo = get_repository()
+    return repo.derived(
+        "job_match.profiles",
+        lambda: fill_text_na(repo.project("job_profile", MATCH_COLUMNS + RENDER_COLUMNS)),
+        depends_on=("job_profile",),
+    )
 
 
+# versão lida antes do frame: se o .xlsx mudar no meio do rerun, o HTML
+# deste frame fica sob a versão antiga, nunca sob a nova
+profiles_version = get_repository().version("job_profile")
 df_profiles = load_job_profiles()
 
+def load_match_index() -> MatchIndex:
+    # índice de match (grades numéricos + bitsets de KPIs/competências), montado
+    # uma vez por processo e refeito quando o Job Profile.xlsx muda
+    return get_repository().derived(
+        "job_match.index",
+        lambda: MatchIndex(load_job_profiles()),
+        depends_on=("job_profile",),
+    )
+
+
+match_index = load_match_index()
+
+# resultados já calculados (match + HTML), compartilhados entre as sessões;
+# descartados junto com o índice quando o Job Profile.xlsx muda
+match_cache = get_repository().derived(
+    "job_match.results",
+    lambda: LRUCache(maxsize=512),
+    depends_on=("job_profile",),
+)
+
+
+def load_signature_index() -> SignatureIndex:
+    # BallTree da busca em todas as famílias: só é montado quando o modo é usado.
+    # Frame e índice saem do repositório dentro do build, na versão anotada por derived()
+    return get_repository().derived(
+        "job_match.signature_index",
+        lambda: SignatureIndex(load_job_profiles(), load_match_index()),
+        depends_on=("job_profile",),
+    )
+
 
 # ----------------------------------------------------------
 # STATE — CAMPOS COM ERRO
@@ -203,6 +264,20 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+# sem filtro de família: perfis de toda a arquitetura, pela assinatura completa
+search_all = st.toggle(
+    "Search across all Job Families",
+    key="search_all",
+    help="Ranks profiles from every Job Family / Sub Job Family by the full form signature.",
+)
+
+# prévia: ranking da subfamília refeito a cada mudança no formulário, antes do Generate
+live_preview = st.toggle(
+    "Live preview",
+    key="live_preview",
+    help="Re-ranks the Sub Job Family profiles on every change to the form.",
+)
+
 col_jf1, col_jf2 = st.columns(2)
 
 job_families = sorted(df_profiles["Job Family"].dropna().unique().tolist())
@@ -215,19 +290,12 @@ with col_jf1:
     )
 
 with col_jf2:
-    if job_family == "Choose option":
-        sub_options = []
-    else:
-        sub_options = (
-            df_profiles[df_profiles["Job Family"] == job_family]["Sub Job Family"]
-            .dropna()
-            .unique()
-            .tolist()
-        )
+    # subfamílias vêm das partições do índice de match (já ordenadas)
+    sub_options = match_index.sub_families.get(job_family, [])
 
     sub_job_family = select_with_error(
         "Sub Job Family",
-        ["Choose option"] + sorted(sub_options),
+        ["Choose option"] + sub_options,
         key="sub_job_family",
     )
 
@@ -243,99 +311,57 @@ c1a, c1b, c1c = st.columns(3)
 with c1a:
     job_category = select_with_error(
         "Job Category",
-        [
-            "Choose option",
-            "Executive",
-            "Manager",
-            "Professional",
-            "Technical Support",
-            "Business Support",
-            "Production",
-        ],
+        ["Choose option"] + FORM_OPTIONS["job_category"],
         key="job_category",
     )
 
     geo_scope = select_with_error(
         "Geographic Scope",
-        ["Choose option", "Local", "Regional", "Multi-country", "Global"],
+        ["Choose option"] + FORM_OPTIONS["geo_scope"],
         key="geo_scope",
     )
 
     org_impact = select_with_error(
         "Organizational Impact",
-        [
-            "Choose option",
-            "Team",
-            "Department / Subfunction",
-            "Function",
-            "Business Unit",
-            "Enterprise-wide",
-        ],
+        ["Choose option"] + FORM_OPTIONS["org_impact"],
         key="org_impact",
     )
 
 with c1b:
     span_control = select_with_error(
         "Span of Control",
-        [
-            "Choose option",
-            "No direct reports",
-            "Supervises team",
-            "Leads professionals",
-            "Leads multiple teams",
-            "Leads managers",
-        ],
+        ["Choose option"] + FORM_OPTIONS["span_control"],
         key="span_control",
     )
 
     nature_work = select_with_error(
         "Nature of Work",
-        [
-            "Choose option",
-            "Process-oriented",
-            "Analysis-oriented",
-            "Specialist",
-            "Leadership-driven",
-        ],
+        ["Choose option"] + FORM_OPTIONS["nature_work"],
         key="nature_work",
     )
 
     financial_impact = select_with_error(
         "Financial Impact",
-        [
-            "Choose option",
-            "No impact",
-            "Cost center impact",
-            "Department-level impact",
-            "Business Unit impact",
-            "Company-wide impact",
-        ],
+        ["Choose option"] + FORM_OPTIONS["financial_impact"],
         key="financial_impact",
     )
 
 with c1c:
     stakeholder_complexity = select_with_error(
         "Stakeholder Complexity",
-        [
-            "Choose option",
-            "Internal team",
-            "Cross-functional",
-            "External vendors",
-            "Customers",
-            "Regulatory/Authorities",
-        ],
+        ["Choose option"] + FORM_OPTIONS["stakeholder_complexity"],
         key="stakeholder_complexity",
     )
 
     decision_type = select_with_error(
         "Decision Type",
-        ["Choose option", "Procedural", "Operational", "Tactical", "Strategic"],
+        ["Choose option"] + FORM_OPTIONS["decision_type"],
         key="decision_type",
     )
 
     decision_horizon = select_with_error(
         "Decision Time Horizon",
-        ["Choose option", "Daily", "Weekly", "Monthly", "Annual", "Multi-year"],
+        ["Choose option"] + FORM_OPTIONS["decision_horizon"],
         key="decision_horizon",
     )
 
@@ -351,67 +377,33 @@ c2a, c2b, c2c = st.columns(3)
 with c2a:
     autonomy = select_with_error(
         "Autonomy Level",
-        [
-            "Choose option",
-            "Close supervision",
-            "Regular guidance",
-            "Independent",
-            "Sets direction for others",
-            "Defines strategy",
-        ],
+        ["Choose option"] + FORM_OPTIONS["autonomy"],
         key="autonomy",
     )
 
     problem_solving = select_with_error(
         "Problem Solving Complexity",
-        [
-            "Choose option",
-            "Routine/Standardized",
-            "Moderate",
-            "Complex",
-            "Ambiguous/Novel",
-            "Organization-level",
-        ],
+        ["Choose option"] + FORM_OPTIONS["problem_solving"],
         key="problem_solving",
     )
 
 with c2b:
     knowledge_depth = select_with_error(
         "Knowledge Depth",
-        [
-            "Choose option",
-            "Entry-level knowledge",
-            "Applied knowledge",
-            "Advanced expertise",
-            "Recognized expert",
-            "Thought leader",
-        ],
+        ["Choose option"] + FORM_OPTIONS["knowledge_depth"],
         key="knowledge_depth",
     )
 
     operational_complexity = select_with_error(
         "Operational Complexity",
-        [
-            "Choose option",
-            "Stable operations",
-            "Some variability",
-            "Complex operations",
-            "High-variability environment",
-        ],
+        ["Choose option"] + FORM_OPTIONS["operational_complexity"],
         key="operational_complexity",
     )
 
 with c2c:
     influence_level = select_with_error(
         "Influence Level",
-        [
-            "Choose option",
-            "Team",
-            "Cross-team",
-            "Multi-function",
-            "External vendors/clients",
-            "Industry-level influence",
-        ],
+        ["Choose option"] + FORM_OPTIONS["influence_level"],
         key="influence_level",
     )
 
@@ -427,78 +419,39 @@ c3a, c3b, c3c = st.columns(3)
 with c3a:
     education = select_with_error(
         "Education Level",
-        [
-            "Choose option",
-            "High School",
-            "Technical Degree",
-            "Bachelor’s",
-            "Post-graduate",
-            "Master’s",
-            "Doctorate",
-        ],
+        ["Choose option"] + FORM_OPTIONS["education"],
         key="education",
     )
 
     experience = select_with_error(
         "Experience Level",
-        [
-            "Choose option",
-            "< 2 years",
-            "2–5 years",
-            "5–10 years",
-            "10–15 years",
-            "15+ years",
-        ],
+        ["Choose option"] + FORM_OPTIONS["experience"],
         key="experience",
     )
 
 with c3b:
     kpis_selected = multiselect_with_error(
         "Primary KPIs",
-        [
-            "Financial",
-            "Customer",
-            "Operational",
-            "Quality",
-            "Safety",
-            "Compliance",
-            "Project Delivery",
-            "People Leadership",
-        ],
+        KPI_OPTIONS,
         key="kpis_selected",
     )
 
     specialization_level = select_with_error(
         "Specialization Level",
-        ["Choose option", "Generalist", "Specialist", "Deep Specialist"],
+        ["Choose option"] + FORM_OPTIONS["specialization_level"],
         key="specialization_level",
     )
 
 with c3c:
     competencies_selected = multiselect_with_error(
         "Core Competencies",
-        [
-            "Communication",
-            "Collaboration",
-            "Analytical Thinking",
-            "Technical Expertise",
-            "Leadership",
-            "Innovation",
-            "Strategic Thinking",
-            "Customer Orientation",
-        ],
+        COMPETENCY_OPTIONS,
         key="competencies_selected",
     )
 
     innovation_resp = select_with_error(
         "Innovation Responsibility",
-        [
-            "Choose option",
-            "Execution",
-            "Incremental improvements",
-            "Major improvements",
-            "Innovation leadership",
-        ],
+        ["Choose option"] + FORM_OPTIONS["innovation_resp"],
         key="innovation_resp",
     )
 
@@ -507,14 +460,14 @@ c3d, c3e = st.columns(2)
 with c3d:
     leadership_type = select_with_error(
         "Leadership Type",
-        ["Choose option", "None", "Team Lead", "Supervisor", "Manager", "Senior Manager", "Director"],
+        ["Choose option"] + FORM_OPTIONS["leadership_type"],
         key="leadership_type",
     )
 
 with c3e:
     org_influence = select_with_error(
         "Organizational Influence",
-        ["Choose option", "Team", "Department", "Business Unit", "Function", "Enterprise-wide"],
+        ["Choose option"] + FORM_OPTIONS["org_influence"],
         key="org_influence",
     )
 
@@ -530,35 +483,108 @@ with btn_col:
 # ==========================================================
 # VALIDAÇÃO + CHAMADA AO MOTOR DE MATCH
 # ==========================================================
-if generate:
-    # montando dicionário de valores
-    form_values = {
-        "job_family": job_family,
-        "sub_job_family": sub_job_family,
-        "job_category": job_category,
-        "geo_scope": geo_scope,
-        "org_impact": org_impact,
-        "span_control": span_control,
-        "nature_work": nature_work,
-        "financial_impact": financial_impact,
-        "stakeholder_complexity": stakeholder_complexity,
-        "decision_type": decision_type,
-        "decision_horizon": decision_horizon,
-        "autonomy": autonomy,
-        "problem_solving": problem_solving,
-        "knowledge_depth": knowledge_depth,
-        "operational_complexity": operational_complexity,
-        "influence_level": influence_level,
-        "education": education,
-        "experience": experience,
-        "specialization_level": specialization_level,
-        "innovation_resp": innovation_resp,
-        "leadership_type": leadership_type,
-        "org_influence": org_influence,
-        "kpis_selected": kpis_selected,
-        "competencies_selected": competencies_selected,
-    }
+# quantos perfis o ranking guarda (o melhor + alternativas)
+TOP_K = 5
+
+
+def match_key(form_values: dict, search_all: bool) -> tuple:
+    # na busca em todas as famílias, Job Family / Sub Job Family não entram na chave
+    if search_all:
+        form_values = {k: v for k, v in form_values.items() if k not in ("job_family", "sub_job_family")}
+    return (search_all, canonical_form(form_values))
+
 
+def run_match(form_values: dict, search_all: bool) -> dict | None:
+    # match + HTML do melhor perfil, calculados uma vez por formulário
+    if search_all:
+        best = search_all_families(form_values, df_profiles, load_signature_index(), top_k=TOP_K)
+    else:
+        best = compute_job_match(form_values, df_profiles, match_index, top_k=TOP_K)
+    if best:
+        best = {**best, "html": render_job_description(best["row"], best["score_pct"], profiles_version)}
+    return best
+
+
+def ranking_table(matches: list, show_family: bool) -> pd.DataFrame:
+    # tabela leve: só as colunas de identificação + scores por componente
+    rows = df_profiles.iloc[[m["position"] for m in matches]]
+    table = {}
+    if show_family:
+        table["Job Family"] = rows["Job Family"].to_numpy()
+        table["Sub Job Family"] = rows["Sub Job Family"].to_numpy()
+    table["Job Profile"] = rows["Job Profile"].to_numpy()
+    table["Global Grade"] = rows["Global Grade"].to_numpy()
+    table["Full Job Code"] = rows["Full Job Code"].to_numpy()
+    table["Match %"] = [m["score_pct"] for m in matches]
+    if "grade" in matches[0]:
+        table["Grade"] = [round(m["grade"], 2) for m in matches]
+        table["KPIs"] = [round(m["kpi"], 2) for m in matches]
+        table["Competencies"] = [round(m["comp"], 2) for m in matches]
+    return pd.DataFrame(table)
+
+
+# montando dicionário de valores
+form_values = {
+    "job_family": job_family,
+    "sub_job_family": sub_job_family,
+    "job_category": job_category,
+    "geo_scope": geo_scope,
+    "org_impact": org_impact,
+    "span_control": span_control,
+    "nature_work": nature_work,
+    "financial_impact": financial_impact,
+    "stakeholder_complexity": stakeholder_complexity,
+    "decision_type": decision_type,
+    "decision_horizon": decision_horizon,
+    "autonomy": autonomy,
+    "problem_solving": problem_solving,
+    "knowledge_depth": knowledge_depth,
+    "operational_complexity": operational_complexity,
+    "influence_level": influence_level,
+    "education": education,
+    "experience": experience,
+    "specialization_level": specialization_level,
+    "innovation_resp": innovation_resp,
+    "leadership_type": leadership_type,
+    "org_influence": org_influence,
+    "kpis_selected": kpis_selected,
+    "competencies_selected": competencies_selected,
+}
+
+# ----------------------------------------------------------
+# PRÉVIA AO VIVO — só o componente afetado é recalculado
+# ----------------------------------------------------------
+def live_ranking(form_values: dict) -> list:
+    # vetores por componente da subfamília atual ficam na sessão; uma nova
+    # subfamília (ou um índice refeito) recomeça do zero
+    family = (form_values["job_family"], form_values["sub_job_family"])
+    live = st.session_state.get("live_match")
+    if live is None or live.family != family or live.index is not match_index:
+        live = LiveMatch(match_index, *family)
+        st.session_state.live_match = live
+    return live.rank(form_values, top_k=TOP_K)
+
+
+if live_preview:
+    st.markdown(
+        '<div class="section-title-form">Live Ranking</div>'
+        '<div class="section-divider"></div>',
+        unsafe_allow_html=True,
+    )
+    if search_all:
+        st.info("Live preview ranks one Sub Job Family; turn off the search across all Job Families.")
+    elif "Choose option" in (job_family, sub_job_family):
+        st.info("Choose a Job Family and a Sub Job Family to see the live ranking.")
+    else:
+        preview = live_ranking(form_values)
+        if preview:
+            st.dataframe(ranking_table(preview, show_family=False), hide_index=True, use_container_width=True)
+        else:
+            st.info("No Job Profiles in the selected Job Family + Sub Job Family.")
+else:
+    st.session_state.pop("live_match", None)
+
+if generate:
     # identifica campos obrigatórios faltantes
     missing_keys = set()
     # selects
@@ -586,6 +612,8 @@ if generate:
         "leadership_type",
         "org_influence",
     ]
+    if search_all:
+        select_keys = select_keys[2:]  # família/subfamília opcionais
     for k in select_keys:
         if form_values[k] == "Choose option" or form_values[k] == "":
             missing_keys.add(k)
@@ -605,16 +633,147 @@ if generate:
     # se passou, limpa flags
     st.session_state.missing_fields = set()
 
-    # chama motor de match
-    best = compute_job_match(form_values, df_profiles)
+    # chama motor de match (top-K por seleção parcial; só o melhor vira Series),
+    # ou reaproveita o resultado de um formulário idêntico (KPIs em qualquer ordem)
+    form_key = match_key(form_values, search_all)
+    best = match_cache.get_or_compute(form_key, lambda: run_match(form_values, search_all))
 
     if not best:
+        st.session_state.pop("match_result", None)
         st.error("No Job Profiles match the selected Job Family + Sub Job Family.")
     else:
-        row = best["row"]
-        score_pct = best["score_pct"]
+        # o resultado fica na sessão para as alternativas sobreviverem aos reruns
+        st.session_state.match_result = {"form": form_key, "search_all": search_all, **best}
+
+    timing.log_summary()
 
-        html_desc = render_job_description(row, score_pct)
 
-        # descrição única, sem scroll interno, fundo branco (controlado no HTML)
-        components.html(html_desc, height=1000, scrolling=False)
+# ==========================================================
+# RESULTADO + ALTERNATIVAS (renderizadas sob demanda)
+# ==========================================================
+def show_result(result: dict, key: str, show_family: bool) -> None:
+    # descrição única, sem scroll interno, fundo branco (controlado no HTML)
+    components.html(result["html"], height=1000, scrolling=False)
+
+    alternatives = result["matches"][1:]
+    if not alternatives:
+        return
+
+    st.markdown(
+        '<div class="section-title-form">Other Close Profiles</div>'
+        '<div class="section-divider"></div>',
+        unsafe_allow_html=True,
+    )
+
+    ranking = ranking_table(alternatives, show_family)
+    st.dataframe(ranking, hide_index=True, use_container_width=True)
+
+    # a descrição de uma alternativa só é montada quando o usuário pede
+    labels = [
+        f"{name} (GG {grade}) — {m['score_pct']}%"
+        for name, grade, m in zip(ranking["Job Profile"], ranking["Global Grade"], alternatives)
+    ]
+    choice = st.selectbox(
+        "View alternative",
+        ["Choose option"] + labels,
+        key=f"{key}_alternative",
+    )
+    if choice != "Choose option":
+        alt = alternatives[labels.index(choice)]
+        alt_html = render_job_description(
+            df_profiles.iloc[alt["position"]], alt["score_pct"], profiles_version
+        )
+        components.html(alt_html, height=1000, scrolling=False)
+
+
+result = st.session_state.get("match_result")
+
+# só exibe enquanto o formulário for o mesmo que gerou o ranking
+if result and result["form"] == match_key(form_values, search_all):
+    show_result(result, "match", result["search_all"])
+
+
+# ==========================================================
+# MATCH POR TEXTO — ANÚNCIO DE VAGA / DESCRIÇÃO DE POSIÇÃO
+# ==========================================================
+def load_text_index() -> TextIndex:
+    # TF-IDF persistido ao lado do snapshot; refeito só quando os textos do Job Profile mudam.
+    # O frame é lido dentro do build, na versão anotada por derived()
+    return get_repository().derived(
+        "job_match.text_index",
+        lambda: text_match.load_text_index(load_job_profiles()),
+        depends_on=("job_profile",),
+    )
+
+
+def run_text_match(text: str) -> dict | None:
+    best = match_text(text, df_profiles, load_text_index(), top_k=TOP_K)
+    if best:
+        best = {**best, "html": render_job_description(best["row"], best["score_pct"], profiles_version)}
+    return best
+
+
+st.markdown(
+    '<div class="section-title-form">Match from a Job Ad</div>'
+    '<div class="section-divider"></div>',
+    unsafe_allow_html=True,
+)
+
+job_ad = st.text_area(
+    "Paste a job ad or position description",
+    key="job_ad_text",
+    height=180,
+)
+
+txt_col, _, _ = st.columns([1, 5, 1])
+with txt_col:
+    generate_text = st.button("Find Profiles from Text", key="generate_text_match")
+
+# espaços/quebras de linha não mudam o texto para o cache
+text_key = ("text", " ".join(job_ad.split()))
+
+if generate_text:
+    if not job_ad.strip():
+        st.session_state.pop("text_match_result", None)
+        st.warning("Paste a job ad or position description first.")
+    else:
+        best = match_cache.get_or_compute(text_key, lambda: run_text_match(job_ad))
+        if not best:
+            st.session_state.pop("text_match_result", None)
+            st.error("No Job Profile shares terms with this text.")
+        else:
+            st.session_state.text_match_result = {"form": text_key, **best}
+
+text_result = st.session_state.get("text_match_result")
+if text_result and text_result["form"] == text_key:
+    show_result(text_result, "text_match", show_family=True)
+
+
+# ----------------------------------------------------------
+# DIAGNÓSTICO — TEMPO POR ETAPA (só com JOB_MATCH_TIMING=1)
+# ----------------------------------------------------------
+if timing.enabled():
+    with st.expander("Timing diagnostics"):
+        spans = timing.snapshot()
+        if not spans:
+            st.caption("No timed stages yet.")
+        else:
+            # uma linha por etapa; histograma em faixas de ms (processo inteiro)
+            rows = [
+                {
+                    "Stage": name,
+                    "Count": s["count"],
+                    "Mean (ms)": s["mean_ms"],
+                    "Max (ms)": s["max_ms"],
+                    **{label: s["histogram"].get(label, 0) for label in timing.BUCKET_LABELS},
+                }
+                for name, s in spans.items()
+            ]
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+        for label, cache in (("Match results", match_cache), ("Rendered HTML", RENDER_CACHE)):
+            s = cache.stats()
+            st.caption(
+                f"{label} cache: {s['size']}/{s['maxsize']} entries, {s['hits']} hits, "
+                f"{s['misses']} misses, {s['evictions']} evictions, hit rate {s['hit_rate']}"
+            )
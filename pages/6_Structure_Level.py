@@ -2,7 +2,7 @@
 
 import streamlit as st
 import pandas as pd
-from utils.data_loader import load_excel_data
+from utils.data_store import get_repository
 
 # ==========================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -152,7 +152,7 @@ The **Structure Level** unifies all these paths into a single, coherent organiza
 # ==========================================================
 # CARREGAMENTO DO ARQUIVO (MANTIDO DO JEITO CERTO)
 # ==========================================================
-data = load_excel_data()
+data = get_repository()
 df = data.get("level_structure", pd.DataFrame())
 
 if df.empty:
@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
 import os, base64
 
+from utils.data_store import get_repository
+
 # ==========================================================
 # PAGE CONFIG
 # ==========================================================
@@ -131,14 +132,18 @@ st.markdown(f"""
 # ==========================================================
 # LOAD DATA
 # ==========================================================
-df = pd.read_excel("data/Job Profile.xlsx")
-
 COL_FAMILY = "Job Family"
 COL_SUBFAMILY = "Sub Job Family"
 COL_PROFILE = "Job Profile"
 COL_PATH = "Career Path"
 COL_GRADE = "Global Grade"
 
+# único subconjunto do Job Profile que o Dashboard lê (KPIs, gráficos e tabela)
+DASHBOARD_COLUMNS = [COL_FAMILY, COL_SUBFAMILY, COL_PROFILE, COL_PATH, COL_GRADE]
+
+repo = get_repository()
+df = repo.project("job_profile", DASHBOARD_COLUMNS)
+
 
 # ==========================================================
 # SIG COLOR PALETTE
@@ -155,6 +160,46 @@ SIG_COLORS = [
 ]
 
 
+# ==========================================================
+# AGREGADOS DO OVERVIEW — calculados uma vez por processo e
+# descartados pelo repositório quando o Job Profile.xlsx muda
+# ==========================================================
+def build_overview(df):
+    kpis = {
+        "Job Families": df[COL_FAMILY].nunique(),
+        "Subfamilies": df[COL_SUBFAMILY].nunique(),
+        "Profiles": df[COL_PROFILE].nunique(),
+        "Career Paths": df[COL_PATH].nunique(),
+        "Global Grades": df[COL_GRADE].nunique(),
+    }
+
+    grade_df = (
+        df.groupby(COL_GRADE)[COL_PROFILE]
+        .nunique()
+        .reset_index(name="Count")
+        .sort_values(COL_GRADE)
+    )
+
+    subf = (
+        df.groupby(COL_FAMILY, observed=True)[COL_SUBFAMILY]
+        .nunique()
+        .reset_index(name="Count")
+        .sort_values("Count", ascending=False)
+    )
+
+    subf["Color"] = [SIG_COLORS[i % len(SIG_COLORS)] for i in range(len(subf))]
+
+    return {"kpis": kpis, "grade_df": grade_df, "subf": subf}
+
+
+overview = repo.derived(
+    "dashboard.overview",
+    # projeção lida dentro do build, depois que derived() anotou a versão
+    lambda: build_overview(repo.project("job_profile", DASHBOARD_COLUMNS)),
+    depends_on=("job_profile",),
+)
+
+
 # ==========================================================
 # TABS (sem emojis)
 # ==========================================================
@@ -169,13 +214,7 @@ with tab1:
     st.markdown("## Executive Job Architecture Overview")
 
     # ========== KPIs HORIZONTAIS ==========
-    kpis = {
-        "Job Families": df[COL_FAMILY].nunique(),
-        "Subfamilies": df[COL_SUBFAMILY].nunique(),
-        "Profiles": df[COL_PROFILE].nunique(),
-        "Career Paths": df[COL_PATH].nunique(),
-        "Global Grades": df[COL_GRADE].nunique(),
-    }
+    kpis = overview["kpis"]
 
     cols = st.columns(len(kpis))
 
@@ -207,12 +246,7 @@ with tab1:
     # --------------------- Grade Distribution --------------------------
     st.markdown("### Grade Distribution (Structure Complexity)")
 
-    grade_df = (
-        df.groupby(COL_GRADE)[COL_PROFILE]
-        .nunique()
-        .reset_index(name="Count")
-        .sort_values(COL_GRADE)
-    )
+    grade_df = overview["grade_df"]
 
     chart = (
         alt.Chart(grade_df)
@@ -233,14 +267,7 @@ with tab1:
     # --------------------- SUBFAMILIES PER FAMILY — BARRAS VERTICAIS SIG --------------------------
     st.markdown("### Subfamilies per Family")
 
-    subf = (
-        df.groupby(COL_FAMILY)[COL_SUBFAMILY]
-        .nunique()
-        .reset_index(name="Count")
-        .sort_values("Count", ascending=False)
-    )
-
-    subf["Color"] = [SIG_COLORS[i % len(SIG_COLORS)] for i in range(len(subf))]
+    subf = overview["subf"]
 
     bar_subf = (
         alt.Chart(subf)
@@ -0,0 +1,211 @@
+# text_match.py
+"""
+Match por texto livre: um anúncio de vaga / descrição de posição colado pelo
+usuário contra os textos longos do Job Profile, com um índice TF-IDF.
+
+O índice (vetorizador + matriz esparsa) é gravado em
+data/.snapshots/job_profile.tfidf.joblib junto com o sha256 dos textos
+indexados e só é refeito quando os textos do frame mudam. Uma consulta é
+um transform + um produto matriz esparsa x vetor.
+"""
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from match_engine import _top_k
+from utils.data_loader import artifact_path
+
+logger = logging.getLogger(__name__)
+
+
+# seções de texto indexadas (colunas ORIGINAIS do Job Profile). As quatro
+# últimas descrevem sobretudo o nível (71 textos distintos em 825 perfis);
+# título e descrição da subfamília trazem o conteúdo da função.
+TEXT_COLUMNS = [
+    "Job Profile",
+    "Sub Job Family Description",
+    "Job Profile Description",
+    "Role Description",
+    "Grade Differentiator",
+    "Qualifications",
+]
+
+# versão do formato salvo: mudar aqui força o rebuild dos índices gravados
+_INDEX_FORMAT = 2
+
+
+def _documents(df_profiles: pd.DataFrame) -> list[str]:
+    """Um documento por perfil: as seções de TEXT_COLUMNS presentes, concatenadas."""
+    cols = [c for c in TEXT_COLUMNS if c in df_profiles.columns]
+    if not cols:
+        raise ValueError(f"Missing columns in Job Profile dataset: {', '.join(TEXT_COLUMNS)}")
+    texts = df_profiles[cols].astype("string").fillna("")
+    return texts[cols[0]].str.cat([texts[c] for c in cols[1:]], sep="\n").tolist()
+
+
+def _documents_sha256(documents: list[str]) -> str:
+    """sha256 dos documentos, na ordem: identifica o conteúdo sobre o qual o índice foi feito."""
+    h = hashlib.sha256()
+    for doc in documents:
+        h.update(doc.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class TextIndex:
+    """
+    TF-IDF (palavras e bigramas, tf sublinear, linhas com norma L2) sobre
+    TEXT_COLUMNS. `matrix` tem uma linha por perfil, na ordem do frame usado
+    no build; `codes` guarda o Full Job Code de cada linha e `sha256` o hash
+    dos documentos indexados (_documents_sha256), para conferência.
+    """
+
+    def __init__(self, vectorizer, matrix, codes: np.ndarray, sha256: str):
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.codes = codes
+        self.sha256 = sha256
+
+    @property
+    def n(self) -> int:
+        return self.matrix.shape[0]
+
+    @classmethod
+    def build(cls, df_profiles: pd.DataFrame) -> "TextIndex":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        documents = _documents(df_profiles)
+        vectorizer = TfidfVectorizer(
+            strip_accents="unicode",
+            stop_words="english",
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+            dtype=np.float32,
+        )
+        matrix = vectorizer.fit_transform(documents).tocsr()
+        codes = df_profiles["Full Job Code"].astype("string").fillna("").to_numpy(dtype=object)
+        return cls(vectorizer, matrix, codes, _documents_sha256(documents))
+
+    def save(self, path: Path) -> None:
+        import joblib
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        payload = {
+            "format": _INDEX_FORMAT,
+            "columns": TEXT_COLUMNS,
+            "sha256": self.sha256,
+            "vectorizer": self.vectorizer,
+            "matrix": self.matrix,
+            "codes": self.codes,
+        }
+        joblib.dump(payload, tmp)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, sha256: str) -> "TextIndex | None":
+        """Índice gravado em `path`, ou None se não existir / for de outros textos (`sha256`) ou outras colunas."""
+        import joblib
+
+        try:
+            payload = joblib.load(path)
+        except (OSError, EOFError, ValueError, KeyError, AttributeError, ImportError):
+            return None
+        if (
+            payload.get("format") != _INDEX_FORMAT
+            or payload.get("columns") != TEXT_COLUMNS
+            or payload.get("sha256") != sha256
+        ):
+            return None
+        return cls(payload["vectorizer"], payload["matrix"], payload["codes"], payload["sha256"])
+
+    def aligned_with(self, df_profiles: pd.DataFrame, sha256: str | None = None) -> bool:
+        """
+        True se as linhas do índice são as linhas de df_profiles, com os
+        mesmos textos. `sha256`: _documents_sha256 de df_profiles, se já calculado.
+        """
+        if self.n != len(df_profiles) or "Full Job Code" not in df_profiles.columns:
+            return False
+        codes = df_profiles["Full Job Code"].astype("string").fillna("").to_numpy(dtype=object)
+        if not np.array_equal(codes, self.codes):
+            return False
+        if sha256 is None:
+            sha256 = _documents_sha256(_documents(df_profiles))
+        return sha256 == self.sha256
+
+    def scores(self, text: str) -> np.ndarray:
+        """Similaridade de cosseno (0-1) do texto com cada perfil."""
+        query = self.vectorizer.transform([text])
+        return (self.matrix @ query.T).toarray().ravel()
+
+
+def load_text_index(df_profiles: pd.DataFrame, data_dir: Path | None = None) -> TextIndex:
+    """
+    TextIndex de df_profiles: lê o gravado ao lado do snapshot se foi feito
+    sobre os mesmos textos (sha256 dos documentos, não do .xlsx em disco,
+    que pode já ser mais novo que o frame) e as mesmas linhas; senão
+    reconstrói e regrava.
+    """
+    sha256 = _documents_sha256(_documents(df_profiles))
+    path = artifact_path("job_profile", "tfidf.joblib", data_dir)
+
+    index = TextIndex.load(path, sha256) if path.exists() else None
+    if index is not None and index.aligned_with(df_profiles, sha256):
+        return index
+
+    t0 = time.perf_counter()
+    index = TextIndex.build(df_profiles)
+    try:
+        index.save(path)
+    except (ImportError, OSError):
+        # pasta somente-leitura: o índice fica só em memória neste processo
+        logger.warning("índice TF-IDF não pôde ser gravado em %s", path)
+    logger.info(
+        "índice TF-IDF: %d perfis x %d termos em %.0f ms",
+        index.n, index.matrix.shape[1], (time.perf_counter() - t0) * 1000,
+    )
+    return index
+
+
+# ==========================================================
+# PUBLIC: MATCH POR TEXTO
+# ==========================================================
+def match_text(
+    text: str,
+    df_profiles: pd.DataFrame,
+    index: TextIndex,
+    top_k: int = 5,
+) -> Dict[str, Any] | None:
+    """
+    Os top_k perfis cujos textos mais se parecem com `text`.
+
+    Mesmo formato de compute_job_match ({"row", "score_pct", "matches"}),
+    mas "score_pct" é a similaridade de cosseno em % (não relativa ao
+    melhor) e os itens de "matches" só trazem "position", "score" e
+    "score_pct". None se nenhum perfil compartilha termos com o texto.
+    """
+    if index.n != len(df_profiles):
+        raise ValueError("TextIndex was built for a different Job Profile dataset")
+    if not text or not text.strip():
+        return None
+
+    scores = index.scores(text)
+    order = _top_k(scores, max(1, top_k))
+    order = order[scores[order] > 0]
+    if len(order) == 0:
+        return None
+
+    matches = [
+        {"position": int(i), "score": float(scores[i]), "score_pct": int(round(float(scores[i]) * 100))}
+        for i in order
+    ]
+    best = df_profiles.iloc[matches[0]["position"]].copy()
+    best["__match_score"] = scores[order[0]]
+
+    return {"row": best, "score_pct": matches[0]["score_pct"], "matches": matches}
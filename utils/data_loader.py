@@ -1,9 +1,26 @@
 # utils/data_loader.py
 # -*- coding: utf-8 -*-
 
+import argparse
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 from pathlib import Path
+
 import pandas as pd
 
+# Copy-on-Write (padrão a partir do pandas 3): as views devolvidas pelo
+# registro nunca alteram o frame compartilhado entre sessões.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # Mapeamento dos arquivos da pasta data/
 DATA_FILES = {
     "career_bands_levels": "Career Bands & Levels.xlsx",
@@ -14,22 +31,722 @@ DATA_FILES = {
     "qualifications": "Qualifications.xlsx",
 }
 
+# Snapshots colunares (Parquet) ficam em data/.snapshots/
+SNAPSHOT_DIRNAME = ".snapshots"
+
+logger = logging.getLogger(__name__)
+
+# raiz do projeto (onde `python -m utils.data_loader` resolve o pacote)
+PROJECT_ROOT = Path(__file__).parents[1]
+
+
+def default_data_dir() -> Path:
+    return PROJECT_ROOT / "data"
+
+
+# ==========================================================
+# SNAPSHOTS COLUNARES
+# ==========================================================
+def _file_fingerprint(path: Path, with_hash: bool = True) -> dict:
+    """Tamanho, mtime e (opcionalmente) sha256 do arquivo de origem."""
+    stat = path.stat()
+    fp = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+        fp["sha256"] = h.hexdigest()
+    return fp
+
+
+def _snapshot_paths(data_dir: Path, key: str) -> tuple[Path, Path]:
+    snap_dir = data_dir / SNAPSHOT_DIRNAME
+    return snap_dir / f"{key}.parquet", snap_dir / f"{key}.json"
+
+
+def _read_manifest(path: Path) -> dict | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _snapshot_is_fresh(source: Path, snap_path: Path, manifest_path: Path) -> bool:
+    """
+    O snapshot vale enquanto o conteúdo do .xlsx for o mesmo.
+
+    - size + mtime iguais ao manifesto → válido sem reler o arquivo;
+    - caso contrário compara o sha256 (ex.: arquivo copiado/tocado sem mudança)
+      e, se bater, atualiza o manifesto para o novo mtime.
+    """
+    manifest = _read_manifest(manifest_path)
+    if manifest is None or not snap_path.exists():
+        return False
+
+    quick = _file_fingerprint(source, with_hash=False)
+    if quick["size"] == manifest.get("size") and quick["mtime_ns"] == manifest.get("mtime_ns"):
+        return True
+
+    full = _file_fingerprint(source)
+    if full["sha256"] != manifest.get("sha256"):
+        return False
+
+    manifest.update(full)
+    try:
+        _write_json_atomic(manifest_path, manifest)
+    except OSError:
+        pass
+    return True
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Colunas de texto do Excel às vezes misturam str e números (ex.: uma célula
+    com 0 numa coluna de descrição) e o Parquet não aceita tipos mistos.
+    Converte apenas os valores não-nulos dessas colunas para str.
+    """
+    out = df.copy(deep=False)
+    out.columns = [str(c) for c in df.columns]
+    for col in out.columns:
+        if out[col].dtype != object:
+            continue
+        if out[col].dropna().map(type).nunique() > 1:
+            out[col] = out[col].map(lambda v: v if pd.isna(v) else str(v))
+    return out
+
+
+def _parse_workbook(path: Path) -> pd.DataFrame:
+    return pd.read_excel(path)
+
+
+def _build_snapshot(source: Path, snap_path: Path, manifest_path: Path) -> pd.DataFrame:
+    """Faz o parse via openpyxl e grava o snapshot + manifesto."""
+    # impressão digital de antes do parse: se o .xlsx for trocado durante o
+    # parse, o manifesto fica com a versão antiga e o próximo load reconstrói
+    fingerprint = _file_fingerprint(source)
+    t0 = time.perf_counter()
+    # mesmo formato do que é lido do snapshot, para o 1º load não diferir dos demais
+    df = _arrow_safe(_parse_workbook(source))
+    parse_seconds = time.perf_counter() - t0
+
+    try:
+        snap_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snap_path.with_suffix(f".parquet.{os.getpid()}.tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, snap_path)
+
+        manifest = {"source": source.name, **fingerprint}
+        manifest["parse_seconds"] = round(parse_seconds, 4)
+        _write_json_atomic(manifest_path, manifest)
+    except (ImportError, OSError, ValueError):
+        # sem pyarrow ou pasta somente-leitura: segue só com o parse do Excel
+        pass
+
+    return df
+
+
+def _select(df: pd.DataFrame, columns: list[str] | None) -> pd.DataFrame:
+    if columns is None:
+        return df
+    return df[[c for c in columns if c in df.columns]]
+
+
+def load_dataset(
+    key: str,
+    data_dir: Path | None = None,
+    force_rebuild: bool = False,
+    columns: list[str] | None = None,
+) -> pd.DataFrame | None:
+    """
+    Carrega um único arquivo de DATA_FILES.
+
+    Usa o snapshot Parquet quando ele corresponde ao .xlsx atual; senão faz o
+    parse com openpyxl e regrava o snapshot. `force_rebuild=True` ignora o
+    snapshot existente. Devolve None se o .xlsx não existir.
+
+    `columns` limita as colunas devolvidas (lidas direto do Parquet, sem
+    materializar o resto). Colunas inexistentes são ignoradas.
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+
+    source = data_dir / DATA_FILES[key]
+    if not source.exists():
+        return None
+
+    snap_path, manifest_path = _snapshot_paths(data_dir, key)
+
+    if not force_rebuild and _snapshot_is_fresh(source, snap_path, manifest_path):
+        try:
+            if columns is not None:
+                try:
+                    return pd.read_parquet(snap_path, columns=list(columns))
+                except ValueError:
+                    pass  # alguma coluna não existe → lê tudo e filtra
+            return _select(pd.read_parquet(snap_path), columns)
+        except Exception:
+            pass  # snapshot corrompido/ilegível → reconstrói
+
+    return _select(_build_snapshot(source, snap_path, manifest_path), columns)
+
+
+def snapshot_is_fresh(key: str, data_dir: Path | None = None) -> bool:
+    """True se o snapshot de `key` pode ser usado sem reabrir o .xlsx."""
+    if data_dir is None:
+        data_dir = default_data_dir()
+    source = data_dir / DATA_FILES[key]
+    if not source.exists():
+        return False
+    return _snapshot_is_fresh(source, *_snapshot_paths(data_dir, key))
+
+
+def artifact_path(key: str, name: str, data_dir: Path | None = None) -> Path:
+    """Caminho de um artefato derivado de `key` na pasta de snapshots (ex.: índices)."""
+    if data_dir is None:
+        data_dir = default_data_dir()
+    return data_dir / SNAPSHOT_DIRNAME / f"{key}.{name}"
+
+
+# ==========================================================
+# NORMALIZAÇÃO (uma vez, no load — não a cada rerun das páginas)
+# ==========================================================
+# Dimensões do Job Profile guardadas como category
+JOB_PROFILE_CATEGORIES = ["Job Family", "Sub Job Family", "Career Path"]
+
+# Colunas derivadas de "Global Grade"
+GRADE_NUM = "Global Grade Num"  # Int64 (<NA> se não for um inteiro)
+GRADE_STR = "Global Grade Str"  # "16", sem ".0"; "" se vazio
+
+# coluna de origem → colunas que a normalização acrescenta a partir dela
+DERIVED_COLUMNS = {"Global Grade": [GRADE_NUM, GRADE_STR]}
+
+
+def normalize_job_profile(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Limpa o Job Profile uma única vez:
+      - Job Family / Sub Job Family / Career Path sem espaços nas pontas,
+        vazios ('', 'nan', 'None') como NA, dtype category;
+      - GRADE_NUM e GRADE_STR a partir de "Global Grade".
+    Funciona também sobre projeções (só trata as colunas presentes).
+    """
+    out = df.copy()
+
+    for col in JOB_PROFILE_CATEGORIES:
+        if col in out.columns:
+            values = out[col].astype("string").str.strip()
+            values = values.mask(values.isin(["", "nan", "None", "<NA>"]))
+            out[col] = values.astype(object).where(values.notna()).astype("category")
+
+    if "Global Grade" in out.columns:
+        num = pd.to_numeric(out["Global Grade"], errors="coerce")
+        num = num.where(num == num.round())
+        out[GRADE_NUM] = num.astype("Int64")
+
+        text = out["Global Grade"].astype("string").str.strip().fillna("")
+        out[GRADE_STR] = out[GRADE_NUM].astype("string").fillna(text).astype(object)
+
+    return out
+
+
+# chave de DATA_FILES → normalização aplicada pelo repositório
+NORMALIZERS = {
+    "job_profile": normalize_job_profile,
+}
+
+
+def _normalize(key: str, df: pd.DataFrame | None) -> pd.DataFrame | None:
+    normalizer = NORMALIZERS.get(key)
+    if df is None or normalizer is None:
+        return df
+    return normalizer(df)
+
 
-def load_excel_data(data_dir: Path | None = None) -> dict:
+def _timed_load(key: str, data_dir: Path) -> tuple[pd.DataFrame | None, dict]:
+    """load_dataset + normalização, com origem e duração."""
+    source = "snapshot" if snapshot_is_fresh(key, data_dir) else "xlsx"
+    t0 = time.perf_counter()
+    df = _normalize(key, load_dataset(key, data_dir))
+    return df, {"source": source, "seconds": round(time.perf_counter() - t0, 4), "pid": os.getpid()}
+
+
+def _rebuild_in_subprocess(key: str, data_dir: Path) -> tuple[pd.DataFrame | None, dict]:
+    """
+    Parse de `key` num interpretador novo (`python -m utils.data_loader
+    --rebuild <key>`) e leitura do snapshot que ele gravou.
+
+    Processo novo com -m, e não multiprocessing: sob o Streamlit o __main__ é
+    o script da página em execução, e o spawn o reexecutaria em cada worker
+    (com get_repository, watcher e warm-up próprios).
+    """
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "utils.data_loader", "--data-dir", str(data_dir), "--rebuild", key],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"rebuild de {key} saiu com {proc.returncode}: {stderr.strip()[-500:]}")
+
+    # sem snapshot gravado (sem pyarrow, pasta somente-leitura) o parse se repete aqui
+    df, timing = _timed_load(key, data_dir)
+    timing.update(source="xlsx", seconds=round(time.perf_counter() - t0, 4), pid=proc.pid)
+    return df, timing
+
+
+def load_excel_data(data_dir: Path | None = None, force_rebuild: bool = False) -> dict:
     """
     Carrega os arquivos .xlsx configurados em DATA_FILES a partir da pasta `data`
     e devolve um dicionário: { chave: DataFrame }.
 
     - Ignora silenciosamente arquivos que não existirem.
     - Permite passar um data_dir customizado, mas por padrão usa <raiz>/data.
+    - Lê dos snapshots Parquet quando estão atualizados (ver load_dataset).
     """
     if data_dir is None:
-        data_dir = Path(__file__).parents[1] / "data"
+        data_dir = default_data_dir()
 
     data = {}
-    for key, filename in DATA_FILES.items():
-        path = data_dir / filename
-        if path.exists():
-            data[key] = pd.read_excel(path)
+    for key in DATA_FILES:
+        df = load_dataset(key, data_dir, force_rebuild=force_rebuild)
+        if df is not None:
+            data[key] = df
 
     return data
+
+
+# ==========================================================
+# REGISTRO PREGUIÇOSO (um dataset por vez)
+# ==========================================================
+def _readonly(value):
+    """
+    Frames compartilhados saem como cópia rasa: com Copy-on-Write, qualquer
+    alteração feita por uma página copia os dados e nunca chega ao original.
+    """
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    return value
+
+
+_MISSING = object()
+
+
+class LazyDatasets(Mapping):
+    """
+    Mapping { chave de DATA_FILES: DataFrame } que só lê um arquivo quando
+    a chave é acessada pela primeira vez e guarda o resultado.
+
+    Uma página que usa só `job_profile` nunca paga pelos outros arquivos.
+    As chaves visíveis são as de DATA_FILES cujo .xlsx existe em data_dir.
+    Tudo o que sai daqui é uma view somente-leitura do frame compartilhado.
+    """
+
+    def __init__(self, data_dir: Path | None = None):
+        self.data_dir = Path(data_dir) if data_dir is not None else default_data_dir()
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._projections: dict[tuple[str, tuple[str, ...]], pd.DataFrame] = {}
+        self._derived: dict[str, object] = {}
+        self._derived_deps: dict[str, tuple[str, ...]] = {}
+        self._locks = {key: threading.Lock() for key in DATA_FILES}
+        self._derived_locks: dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        # warm-up em andamento: chave → (versão da chave no envio, Future)
+        self._pending: dict[str, tuple[int, Future]] = {}
+        self._listeners: dict[str, tuple[tuple[str, ...], object]] = {}
+        self._versions: dict[str, int] = {key: 0 for key in DATA_FILES}
+        self._watcher: "DataWatcher | None" = None
+        self.load_timings: dict[str, dict] = {}
+
+    def _available(self) -> list[str]:
+        return [k for k, name in DATA_FILES.items() if (self.data_dir / name).exists()]
+
+    def _frame(self, key: str) -> pd.DataFrame:
+        if key not in DATA_FILES:
+            raise KeyError(key)
+
+        df = self._frames.get(key)
+        if df is not None:
+            return df
+
+        # warm-up em andamento para esta chave: espera o worker em vez de repetir o parse
+        pending = self._pending.get(key)
+        if pending is not None:
+            version, fut = pending
+            try:
+                self._store(key, version, *fut.result())
+            except CancelledError:
+                pass  # invalidado antes de rodar
+            except Exception:
+                logger.exception("warm-up de %s falhou; lendo no processo atual", key)
+                self._drop_pending(key, fut)
+            df = self._frames.get(key)
+            if df is not None:
+                return df
+
+        # lock por chave: duas sessões pedindo o mesmo arquivo fazem um parse só
+        with self._locks[key]:
+            df = self._frames.get(key)
+            if df is None:
+                df, timing = _timed_load(key, self.data_dir)
+                if df is None:
+                    raise KeyError(key)
+                self._frames[key] = df
+                self.load_timings[key] = timing
+        return df
+
+    def _store(self, key: str, version: int, df: pd.DataFrame | None, timing: dict) -> None:
+        """Guarda o frame de um warm-up, a menos que `key` tenha mudado desde o envio."""
+        with self._locks[key]:
+            if self._versions[key] != version:
+                return  # invalidado durante o parse: o frame é do arquivo antigo
+            self._pending.pop(key, None)
+            if df is not None and key not in self._frames:
+                self._frames[key] = df
+                self.load_timings[key] = timing
+
+    def _drop_pending(self, key: str, fut: Future) -> None:
+        with self._locks[key]:
+            pending = self._pending.get(key)
+            if pending is not None and pending[1] is fut:
+                del self._pending[key]
+
+    def warm_up(self, keys: list[str] | None = None, max_workers: int | None = None) -> None:
+        """
+        Pré-carrega os datasets sem bloquear quem chamou.
+
+        Snapshots atualizados são lidos numa thread (milissegundos); os .xlsx
+        que precisam de parse vão para subprocessos (_rebuild_in_subprocess),
+        um arquivo por processo, em paralelo. Quem pedir um dataset ainda em
+        parse espera o processo dele. Tempos por arquivo ficam em `load_timings`.
+        """
+        keys = [
+            k for k in (keys if keys is not None else DATA_FILES) if k in self and not self.is_loaded(k) and k not in self._pending
+        ]
+        stale = [k for k in keys if not snapshot_is_fresh(k, self.data_dir)]
+        fresh = [k for k in keys if k not in stale]
+        t_start = time.perf_counter()
+
+        if stale:
+            try:
+                # cada thread só espera o seu subprocesso
+                pool = ThreadPoolExecutor(
+                    max_workers=max_workers or min(len(stale), os.cpu_count() or 1),
+                    thread_name_prefix="data-rebuild",
+                )
+                for key in stale:
+                    version = self._versions[key]
+                    fut = pool.submit(_rebuild_in_subprocess, key, self.data_dir)
+                    self._pending[key] = (version, fut)
+                    fut.add_done_callback(lambda f, k=key, v=version: self._on_warm(k, v, f, t_start))
+                pool.shutdown(wait=False)
+            except (OSError, RuntimeError):
+                logger.exception("pool de warm-up indisponível; parse será sob demanda")
+                for key in stale:
+                    self._pending.pop(key, None)
+
+        def _load_fresh():
+            for key in fresh:
+                try:
+                    self._frame(key)
+                except KeyError:
+                    pass
+            self._log_warm(t_start)
+
+        threading.Thread(target=_load_fresh, name="data-warm-up", daemon=True).start()
+
+    def _on_warm(self, key: str, version: int, fut: Future, t_start: float) -> None:
+        if fut.cancelled():
+            self._drop_pending(key, fut)
+            return
+        error = fut.exception()
+        if error is not None:
+            logger.error("warm-up de %s falhou; parse será sob demanda", key, exc_info=error)
+            self._drop_pending(key, fut)
+            return
+        self._store(key, version, *fut.result())
+        self._log_warm(t_start)
+
+    # ------------------------------------------------------
+    # invalidação por dependência
+    # ------------------------------------------------------
+    def version(self, key: str) -> int:
+        """Quantas vezes `key` mudou desde que o processo subiu (para chaves de cache)."""
+        return self._versions[key]
+
+    def on_change(self, name: str, depends_on: tuple[str, ...], callback) -> None:
+        """
+        Registra um cache externo (ex.: `generate_map.clear` de um
+        @st.cache_data) a ser limpo quando algum dataset de `depends_on`
+        mudar. Idempotente por `name`: a página pode chamar a cada rerun.
+        """
+        self._listeners[name] = (tuple(depends_on), callback)
+
+    def invalidate(self, key: str) -> list[str]:
+        """
+        Descarta o frame de `key` e tudo o que depende dele (projeções,
+        artefatos de `derived`, caches de `on_change`). O resto continua
+        quente. Devolve os nomes dos artefatos descartados.
+
+        Warm-ups e builds de `derived` ainda em andamento sobre a versão
+        anterior não guardam o resultado (ver _store e derived).
+        """
+        dropped = []
+        with self._locks[key]:
+            self._versions[key] += 1
+            pending = self._pending.pop(key, None)
+            if self._frames.pop(key, None) is not None:
+                dropped.append(key)
+            for memo_key in [mk for mk in self._projections if mk[0] == key]:
+                del self._projections[memo_key]
+                dropped.append(f"{key}[{len(memo_key[1])} cols]")
+            self.load_timings.pop(key, None)
+        if pending is not None:
+            pending[1].cancel()  # ainda na fila; se já rodando, _store descarta o resultado
+
+        for name in [n for n, deps in list(self._derived_deps.items()) if key in deps]:
+            self._derived.pop(name, None)
+            self._derived_deps.pop(name, None)
+            dropped.append(name)
+
+        for name, (deps, callback) in list(self._listeners.items()):
+            if key in deps:
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("falha ao invalidar %s", name)
+                dropped.append(name)
+
+        logger.info("%s mudou; invalidados: %s", DATA_FILES[key], ", ".join(dropped) or "-")
+        return dropped
+
+    def start_watcher(self, interval: float = 2.0) -> "DataWatcher":
+        if self._watcher is None or not self._watcher.is_alive():
+            self._watcher = DataWatcher(self, interval)
+            self._watcher.start()
+        return self._watcher
+
+    def _log_warm(self, t_start: float) -> None:
+        if self._pending:
+            return
+        logger.info(
+            "warm-up de data/ concluído em %.2fs: %s",
+            time.perf_counter() - t_start,
+            ", ".join(f"{k}={t['seconds']:.3f}s ({t['source']})" for k, t in self.load_timings.items()),
+        )
+
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        return _readonly(self._frame(key))
+
+    def __contains__(self, key: object) -> bool:
+        return key in DATA_FILES and (self.data_dir / DATA_FILES[key]).exists()
+
+    def __iter__(self):
+        return iter(self._available())
+
+    def __len__(self) -> int:
+        return len(self._available())
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._frames
+
+    def project(self, key: str, columns: list[str] | tuple[str, ...]) -> pd.DataFrame:
+        """
+        Só as colunas pedidas de um dataset, memorizado por (chave, colunas).
+
+        Cada consumidor declara seu próprio conjunto de colunas (ex.:
+        match_engine.MATCH_COLUMNS) e todas as sessões compartilham o mesmo
+        frame projetado. Se o dataset inteiro já estiver carregado, a projeção
+        sai dele; senão lê apenas essas colunas do snapshot.
+        """
+        if key not in DATA_FILES:
+            raise KeyError(key)
+
+        cols = tuple(dict.fromkeys(columns))
+        memo_key = (key, cols)
+        df = self._projections.get(memo_key)
+        if df is not None:
+            return _readonly(df)
+
+        if key in self._pending:
+            self._frame(key)  # o warm-up já está lendo o arquivo inteiro
+
+        with self._locks[key]:
+            df = self._projections.get(memo_key)
+            if df is None:
+                full = self._frames.get(key)
+                if full is not None:
+                    wanted = list(cols) + [d for c in cols for d in DERIVED_COLUMNS.get(c, [])]
+                    df = _select(full, wanted)
+                else:
+                    df = _normalize(key, load_dataset(key, self.data_dir, columns=list(cols)))
+                    if df is None:
+                        raise KeyError(key)
+                self._projections[memo_key] = df
+        return _readonly(df)
+
+    def derived(self, name: str, build, depends_on: tuple[str, ...] = ()):
+        """
+        Artefato calculado a partir dos datasets (frame limpo, agregados,
+        índices...), construído uma vez por processo e memorizado por `name`.
+
+        `depends_on` lista as chaves de DATA_FILES de que ele depende. Se
+        alguma delas for invalidada durante o build, o resultado volta para
+        quem chamou mas não é memorizado (o próximo acesso reconstrói).
+        """
+        value = self._derived.get(name, _MISSING)
+        if value is not _MISSING:
+            return _readonly(value)
+
+        with self._registry_lock:
+            lock = self._derived_locks.setdefault(name, threading.Lock())
+
+        with lock:
+            value = self._derived.get(name, _MISSING)
+            if value is _MISSING:
+                versions = [self._versions[k] for k in depends_on]
+                value = build()
+                if versions == [self._versions[k] for k in depends_on]:
+                    self._derived[name] = value
+                    self._derived_deps[name] = tuple(depends_on)
+        return _readonly(value)
+
+
+class DataWatcher(threading.Thread):
+    """
+    Observa os arquivos de DATA_FILES (polling de size + mtime, sem
+    dependências extras) e, quando um .xlsx muda, invalida só o que depende
+    dele no repositório e recarrega esse arquivo em segundo plano.
+
+    Uma mudança só é aplicada depois de duas leituras iguais seguidas, para
+    não pegar um arquivo ainda sendo copiado.
+    """
+
+    def __init__(self, repo: LazyDatasets, interval: float = 2.0):
+        super().__init__(name="data-watcher", daemon=True)
+        self.repo = repo
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._seen = {key: self._stat(key) for key in DATA_FILES}
+        self._candidate: dict[str, tuple | None] = {}
+
+    def _stat(self, key: str) -> tuple | None:
+        try:
+            st = (self.repo.data_dir / DATA_FILES[key]).stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def poll(self) -> list[str]:
+        """Uma rodada de verificação; devolve as chaves invalidadas."""
+        changed = []
+        for key in DATA_FILES:
+            current = self._stat(key)
+            if current == self._seen[key]:
+                self._candidate.pop(key, None)
+                continue
+            if self._candidate.get(key, "unset") != current:
+                self._candidate[key] = current  # espera estabilizar
+                continue
+            self._seen[key] = current
+            self._candidate.pop(key, None)
+            self.repo.invalidate(key)
+            changed.append(key)
+
+        # só recarrega o que ainda existe (um .xlsx apagado fica só invalidado)
+        reload = [k for k in changed if k in self.repo]
+        if reload:
+            self.repo.warm_up(reload)
+        return changed
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("erro no watcher de data/")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def rebuild_snapshots(data_dir: Path | None = None, keys: list[str] | None = None) -> dict:
+    """Força o parse dos .xlsx de `keys` (todos, se None) e regrava os snapshots."""
+    if keys is None:
+        return load_excel_data(data_dir, force_rebuild=True)
+    data = {}
+    for key in keys:
+        df = load_dataset(key, data_dir, force_rebuild=True)
+        if df is not None:
+            data[key] = df
+    return data
+
+
+def snapshot_report(data_dir: Path | None = None) -> pd.DataFrame:
+    """
+    Compara, por arquivo, o tempo de parse do Excel (openpyxl) com o tempo
+    de leitura do snapshot Parquet. Reconstrói snapshots ausentes/antigos.
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+
+    rows = []
+    for key, filename in DATA_FILES.items():
+        source = data_dir / filename
+        if not source.exists():
+            continue
+
+        snap_path, _ = _snapshot_paths(data_dir, key)
+        load_dataset(key, data_dir)
+
+        t0 = time.perf_counter()
+        df = _parse_workbook(source)
+        parse_s = time.perf_counter() - t0
+
+        snapshot_s = None
+        if snap_path.exists():
+            t0 = time.perf_counter()
+            pd.read_parquet(snap_path)
+            snapshot_s = time.perf_counter() - t0
+
+        rows.append({
+            "dataset": key,
+            "file": filename,
+            "rows": df.shape[0],
+            "cols": df.shape[1],
+            "xlsx_kb": round(source.stat().st_size / 1024, 1),
+            "snapshot_kb": round(snap_path.stat().st_size / 1024, 1) if snap_path.exists() else None,
+            "parse_ms": round(parse_s * 1000, 1),
+            "snapshot_ms": round(snapshot_s * 1000, 1) if snapshot_s is not None else None,
+            "speedup": round(parse_s / snapshot_s, 1) if snapshot_s else None,
+        })
+
+    return pd.DataFrame(rows)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Snapshots Parquet dos arquivos de data/.")
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--rebuild", nargs="*", choices=list(DATA_FILES), metavar="KEY", default=None,
+                        help="força o parse dos .xlsx (de KEY..., ou de todos)")
+    parser.add_argument("--report", action="store_true", help="mostra parse vs snapshot por arquivo")
+    args = parser.parse_args(argv)
+
+    if args.rebuild is not None:
+        rebuild_snapshots(args.data_dir, args.rebuild or None)
+    if args.report or args.rebuild is None:
+        print(snapshot_report(args.data_dir).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
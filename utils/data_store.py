@@ -0,0 +1,21 @@
+# utils/data_store.py
+# -*- coding: utf-8 -*-
+#
+# Repositório de dados único por processo do servidor Streamlit.
+# Todas as páginas leem daqui: cada .xlsx é lido uma vez e as páginas
+# recebem views somente-leitura (ver utils.data_loader.LazyDatasets).
+
+import streamlit as st
+
+from utils.data_loader import LazyDatasets
+
+
+@st.cache_resource(show_spinner=False)
+def get_repository() -> LazyDatasets:
+    # a 1ª chamada (app.py ou qualquer página aberta direto) já dispara o
+    # parse paralelo de data/, antes de alguma página pedir um dataset
+    repo = LazyDatasets()
+    repo.warm_up()
+    # .xlsx novos em data/ invalidam só o que depende deles, sem reiniciar
+    repo.start_watcher()
+    return repo
@@ -0,0 +1,88 @@
+# utils/svg_sprite.py
+# -*- coding: utf-8 -*-
+#
+# Sprite de ícones SVG: cada .svg de uma pasta vira um <symbol>, lido uma vez
+# por processo. O documento HTML leva cada símbolo usado uma única vez
+# (defs) e cada ocorrência do ícone é só um <svg><use href="#..."/></svg>.
+#
+# Os cards vão em iframes (components.html) separados, sem arquivo
+# compartilhado entre eles, então cada documento embute só os símbolos que
+# referencia, não a pasta inteira.
+
+import os
+import re
+from typing import Dict, Iterable
+
+_SVG_ROOT = re.compile(r"<svg\b([^>]*)>", re.IGNORECASE)
+_ATTR = re.compile(r'([\w:-]+)\s*=\s*"([^"]*)"')
+_ID_REF = re.compile(r'(id="|url\(#|href="#)([^")]+)')
+_BETWEEN_TAGS = re.compile(r">\s+<")
+
+# atributos da raiz que não fazem sentido no <symbol> (tamanho fica no <use>)
+_ROOT_ONLY = {"width", "height", "xmlns", "xmlns:xlink", "version", "id", "x", "y"}
+
+
+class SvgSprite:
+    """
+    Símbolos de todos os .svg de `folder`, pelo nome do arquivo. O id do
+    símbolo é "icon-<nome sem .svg>"; ids internos (clipPath etc.) ganham o
+    mesmo prefixo para não colidirem entre ícones no mesmo documento.
+    """
+
+    def __init__(self, folder: str):
+        self.symbols: Dict[str, str] = {}
+        self.sizes: Dict[str, tuple[str, str, str]] = {}
+        if not os.path.isdir(folder):
+            return
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(".svg"):
+                with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                    self._add(name, f.read())
+
+    @staticmethod
+    def symbol_id(name: str) -> str:
+        return "icon-" + os.path.splitext(name)[0]
+
+    def _add(self, name: str, svg: str) -> None:
+        root = _SVG_ROOT.search(svg)
+        end = svg.rfind("</svg>")
+        if root is None or end < root.end():
+            return
+        sid = self.symbol_id(name)
+        attrs = dict(_ATTR.findall(root.group(1)))
+        width, height = attrs.get("width", ""), attrs.get("height", "")
+        view_box = attrs.get("viewBox") or (f"0 0 {width} {height}" if width and height else "")
+
+        inner = _ID_REF.sub(lambda m: f"{m.group(1)}{sid}-{m.group(2)}", svg[root.end():end])
+        inner = _BETWEEN_TAGS.sub("><", inner)
+        kept = " ".join(
+            f'{k}="{v}"' for k, v in attrs.items() if k not in _ROOT_ONLY and k != "viewBox"
+        )
+        self.symbols[name] = (
+            f'<symbol id="{sid}" viewBox="{view_box}"{" " + kept if kept else ""}>{inner.strip()}</symbol>'
+        )
+        self.sizes[name] = (width, height, view_box)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def use(self, name: str) -> str:
+        """Referência ao ícone, com o mesmo tamanho do SVG original ("" se não existe)."""
+        if name not in self.symbols:
+            return ""
+        width, height, view_box = self.sizes[name]
+        size = "".join(f' {k}="{v}"' for k, v in (("width", width), ("height", height)) if v)
+        return f'<svg{size} viewBox="{view_box}" aria-hidden="true"><use href="#{self.symbol_id(name)}"/></svg>'
+
+    def defs(self, names: Iterable[str]) -> str:
+        """
+        Bloco oculto com os <symbol> de `names` (cada um uma vez, na ordem),
+        para ir uma vez no documento, antes dos <use>.
+        """
+        symbols = [self.symbols[n] for n in dict.fromkeys(names) if n in self.symbols]
+        if not symbols:
+            return ""
+        return (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="0" height="0" '
+            'style="position:absolute" aria-hidden="true">' + "".join(symbols) + "</svg>"
+        )
@@ -0,0 +1,124 @@
+# utils/timing.py
+# -*- coding: utf-8 -*-
+#
+# Spans de tempo nomeados para os caminhos quentes (match, renderer).
+# Desligado por padrão: span() devolve um contexto vazio compartilhado, sem
+# relógio nem lock. Ligado (JOB_MATCH_TIMING=1 no ambiente ou enable()), cada
+# span soma contagem, total, máximo e um histograma em faixas de ms,
+# agregados por nome para o processo inteiro (ver snapshot / log_summary).
+
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# limites superiores (ms) das faixas do histograma; a última faixa é "> 1000"
+BUCKETS_MS = (0.01, 0.03, 0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000)
+BUCKET_LABELS = [f"<={b:g}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]:g}ms"]
+
+_NULL_SPAN = nullcontext()
+_lock = threading.Lock()
+_stats: Dict[str, dict] = {}
+_enabled = os.environ.get("JOB_MATCH_TIMING", "").strip() not in ("", "0")
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record(self.name, time.perf_counter() - self.t0)
+
+
+def span(name: str):
+    """Contexto que mede o bloco como o span `name` (nada é medido se desligado)."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name: str):
+    """Decorador: cada chamada da função é um span `name`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t0)
+        return wrapper
+    return decorate
+
+
+def record(name: str, seconds: float) -> None:
+    """Soma uma medição de `seconds` ao span `name`."""
+    ms = seconds * 1000
+    with _lock:
+        st = _stats.get(name)
+        if st is None:
+            st = _stats[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": [0] * len(BUCKET_LABELS)}
+        st["count"] += 1
+        st["total_ms"] += ms
+        st["max_ms"] = max(st["max_ms"], ms)
+        st["buckets"][bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+
+def snapshot() -> Dict[str, dict]:
+    """
+    Cópia dos agregados: nome → count, total_ms, mean_ms, max_ms e
+    histogram (faixa de BUCKET_LABELS → contagem, só faixas não vazias).
+    """
+    with _lock:
+        return {
+            name: {
+                "count": st["count"],
+                "total_ms": round(st["total_ms"], 3),
+                "mean_ms": round(st["total_ms"] / st["count"], 4),
+                "max_ms": round(st["max_ms"], 3),
+                "histogram": {label: n for label, n in zip(BUCKET_LABELS, st["buckets"]) if n},
+            }
+            for name, st in sorted(_stats.items())
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def log_summary(level: int = logging.INFO) -> None:
+    """Uma linha de log com contagem / média / máximo de cada span, do maior total para o menor."""
+    spans = sorted(snapshot().items(), key=lambda kv: -kv[1]["total_ms"])
+    if spans:
+        logger.log(level, "timing: %s", "; ".join(
+            f"{name} n={s['count']} mean={s['mean_ms']}ms max={s['max_ms']}ms" for name, s in spans
+        ))